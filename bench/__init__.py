@@ -0,0 +1,251 @@
+"""Stage and end-to-end benchmarks of the derivation pipeline
+
+Inputs are the vectors in tests/test_vectors.json plus deterministic
+synthetic ones. Every stage is warmed up, then timed over several
+repeats; per-call statistics go to a JSON report that compare() checks
+against a stored baseline:
+
+    python -m bench run -o current.json
+    python -m bench compare baseline.json current.json --threshold 0.1
+
+thread_scaling() measures derive_monero throughput on thread pools of
+growing size, which only scales on a free-threaded (PEP 703) build:
+
+    python -m bench threads --threads 1,2,4,8
+"""
+
+import hashlib
+import json
+import platform
+import random
+import statistics
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import bip39
+from bip39.data import wordlist
+from monero_mnemonic import mn_decode, mn_encode
+from slip0010 import ed25519 as crypto
+from slip0010 import ed25519_2
+from slip0010.sd import DEFAULT_SLIP0010_PATH, SeedDerivation
+from slip0010.wallet import Wallet
+from util import hash160_backend
+from util.ripemd160 import RIPEMD160
+
+VECTORS = "tests/test_vectors.json"
+SYNTHETIC = 8
+THREADS = (1, 2, 4, 8)
+
+Report = Dict[str, Any]
+
+
+def synthetic_mnemonic(rng: random.Random, words: int = 12) -> str:
+    """A valid BIP39 mnemonic over random entropy"""
+    ent_bits = words * 11 * 32 // 33
+    entropy = rng.getrandbits(ent_bits).to_bytes(ent_bits // 8, "big")
+    cs_bits = ent_bits // 32
+    checksum = hashlib.sha256(entropy).digest()[0] >> (8 - cs_bits)
+    n = int.from_bytes(entropy, "big") << cs_bits | checksum
+    idxs = [(n >> (11 * i)) & 0x7FF for i in reversed(range(words))]
+    return " ".join(wordlist[i] for i in idxs)
+
+
+def load_inputs(path: str = VECTORS, synthetic: int = SYNTHETIC) -> List:
+    """(mnemonic, passphrase) pairs, the vectors then synthetic ones"""
+    with open(path, encoding="utf-8") as f:
+        pairs = [(line[1], line[2]) for line in json.load(f)]
+    rng = random.Random(0)
+    for i in range(synthetic):
+        pairs.append((synthetic_mnemonic(rng, 24 if i % 2 else 12), ""))
+    return pairs
+
+
+def derive_monero(mnem: str, passp: str) -> Tuple:
+    """The end-to-end derivation, down to the words and spend key"""
+    sd = SeedDerivation.derive_monero(mnem, passp)
+    return sd.electrum_words, sd.spend_pub
+
+
+class _Inputs:
+    """The stage inputs for pairs, each derived on first use"""
+
+    def __init__(self, pairs: Sequence[Tuple[str, str]]):
+        self.pairs = pairs
+
+    @cached_property
+    def sds(self) -> List[SeedDerivation]:
+        return [SeedDerivation.derive_monero(m, p) for m, p in self.pairs]
+
+    @cached_property
+    def seeds(self) -> List[bytes]:
+        return [sd.master_seed for sd in self.sds]
+
+    @cached_property
+    def masters(self) -> List[bytes]:
+        return [sd.monero_master for sd in self.sds]
+
+    @cached_property
+    def scalars(self) -> List[int]:
+        return [crypto.EdScalar(m).v for m in self.masters]
+
+    @cached_property
+    def blobs(self) -> List[bytes]:
+        rng = random.Random(1)
+        return [rng.randbytes(n) for n in (32, 64, 200, 1000)]
+
+
+def stages(
+    pairs: Sequence[Tuple[str, str]],
+) -> Dict[str, Tuple[Callable, Callable[[], List[Tuple]]]]:
+    """
+    name -> (function, argument tuples) for every benchmarked stage, the
+    arguments as a function building them, so that only the inputs of
+    the stages run are derived.
+    """
+    inputs = _Inputs(pairs)
+
+    def walk(seed):
+        wl = Wallet.from_master_secret(seed, use_ed25519=True)
+        return wl.get_child_for_path(DEFAULT_SLIP0010_PATH)
+
+    return {
+        "pbkdf2": (
+            bip39.mnemonics_to_seed,
+            lambda: [(m, p.encode("utf8")) for m, p in pairs],
+        ),
+        "slip0010_walk": (walk, lambda: [(s,) for s in inputs.seeds]),
+        "keccak": (
+            crypto.cn_fast_hash,
+            lambda: [(b,) for b in inputs.blobs + inputs.masters],
+        ),
+        "scalarmult_B": (
+            ed25519_2.scalarmult_B,
+            lambda: [(e,) for e in inputs.scalars],
+        ),
+        "encodepoint": (
+            ed25519_2.encodepoint,
+            lambda: [(ed25519_2.scalarmult_B(e),) for e in inputs.scalars],
+        ),
+        "mn_encode": (mn_encode, lambda: [(m, True) for m in inputs.masters]),
+        "mn_decode": (
+            mn_decode,
+            lambda: [(mn_encode(m, True),) for m in inputs.masters],
+        ),
+        "ripemd160": (
+            lambda b: RIPEMD160(b).digest(),
+            lambda: [(b,) for b in inputs.blobs + inputs.seeds],
+        ),
+        "derive_monero": (derive_monero, lambda: list(pairs)),
+    }
+
+
+def time_stage(
+    func: Callable, args: Sequence[Tuple], repeat: int = 5, warmup: int = 1
+) -> Dict[str, float]:
+    """
+    Runs func over every argument tuple warmup times, then repeat
+    times; statistics are of the per-call time of each repeat.
+    """
+    for _ in range(warmup):
+        for a in args:
+            func(*a)
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for a in args:
+            func(*a)
+        samples.append((perf_counter() - start) / len(args))
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if repeat > 1 else 0.0,
+        "repeat": repeat,
+        "calls": len(args),
+    }
+
+
+def meta() -> Dict[str, Any]:
+    """The interpreter and backends a report was measured on"""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "hash160_backend": hash160_backend(),
+        # sys._is_gil_enabled is new in 3.13
+        "gil_enabled": getattr(sys, "_is_gil_enabled", lambda: True)(),
+    }
+
+
+def run(
+    names: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    path: str = VECTORS,
+    synthetic: int = SYNTHETIC,
+) -> Report:
+    """Times the named stages (default: all) and returns the report."""
+    table = stages(load_inputs(path, synthetic))
+    unknown = set(names or ()) - set(table)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+    return {
+        "meta": meta(),
+        "stages": {
+            name: time_stage(func, args(), repeat, warmup)
+            for name, (func, args) in table.items()
+            if names is None or name in names
+        },
+    }
+
+
+def thread_scaling(
+    threads: Sequence[int] = THREADS,
+    path: str = VECTORS,
+    synthetic: int = SYNTHETIC,
+    rounds: int = 2,
+) -> Report:
+    """
+    derive_monero over the inputs, rounds times, on a thread pool of each
+    size: derivations per second and the speedup over the first size.
+    """
+    work = load_inputs(path, synthetic) * rounds
+    derive_monero(*work[0])
+    results: Dict[str, Dict[str, float]] = {}
+    base = 0.0
+    for n in threads:
+        with ThreadPoolExecutor(n) as ex:
+            start = perf_counter()
+            for _ in ex.map(lambda pair: derive_monero(*pair), work):
+                pass
+            rate = len(work) / (perf_counter() - start)
+        base = base or rate
+        results[str(n)] = {"per_second": rate, "speedup": rate / base}
+    return {"meta": meta(), "calls": len(work), "threads": results}
+
+
+def compare(
+    baseline: Report, current: Report, threshold: float = 0.1, stat="median"
+) -> List[Tuple[str, float, Optional[float], Optional[float], bool]]:
+    """
+    (stage, baseline, current, relative change, regressed) for every
+    stage in the baseline; regressed when slower by more than threshold.
+    A stage missing from the current report is regressed, with current
+    and change None.
+    """
+    rows = []
+    for name, base in baseline["stages"].items():
+        cur = current["stages"].get(name)
+        if cur is None:
+            rows.append((name, base[stat], None, None, True))
+            continue
+        if base[stat]:
+            change = cur[stat] / base[stat] - 1
+        else:
+            # below the timer's resolution in the baseline
+            change = float("inf") if cur[stat] else 0.0
+        rows.append((name, base[stat], cur[stat], change, change > threshold))
+    return rows
@@ -0,0 +1,108 @@
+"""python -m bench run|compare|threads, see the bench package"""
+
+import argparse
+import json
+import sys
+
+import bench
+
+
+def _run(args) -> int:
+    report = bench.run(
+        args.stages.split(",") if args.stages else None,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        path=args.vectors,
+        synthetic=args.synthetic,
+    )
+    _write(report, args.output)
+    return 0
+
+
+def _write(report, output) -> None:
+    out = json.dumps(report, indent=2) + "\n"
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        sys.stdout.write(out)
+
+
+def _threads(args) -> int:
+    report = bench.thread_scaling(
+        [int(n) for n in args.threads.split(",")],
+        path=args.vectors,
+        synthetic=args.synthetic,
+        rounds=args.rounds,
+    )
+    _write(report, args.output)
+    return 0
+
+
+def _compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    rows = bench.compare(baseline, current, args.threshold, args.stat)
+    regressed = False
+    for name, base, cur, change, bad in rows:
+        regressed |= bad
+        if cur is None:
+            print(f"{name:16} {base * 1e3:10.3f} ms {'-':>13} {'':8}  MISSING")
+            continue
+        mark = "REGRESSED" if bad else "ok"
+        print(
+            f"{name:16} {base * 1e3:10.3f} ms {cur * 1e3:10.3f} ms "
+            f"{change:+8.1%}  {mark}"
+        )
+    return 1 if regressed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="time the stages, print a JSON report")
+    run.add_argument("-o", "--output", help="write the report to a file")
+    run.add_argument("--stages", help="comma separated stages (default: all)")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--vectors", default=bench.VECTORS)
+    run.add_argument("--synthetic", type=int, default=bench.SYNTHETIC)
+    run.set_defaults(func=_run)
+
+    cmp = sub.add_parser("compare", help="fail on regressions vs a baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed relative slowdown (default: 0.1)",
+    )
+    cmp.add_argument(
+        "--stat", choices=["min", "median", "mean"], default="median"
+    )
+    cmp.set_defaults(func=_compare)
+
+    threads = sub.add_parser(
+        "threads", help="derive_monero throughput per thread count"
+    )
+    threads.add_argument("-o", "--output", help="write the report to a file")
+    threads.add_argument(
+        "--threads",
+        default=",".join(map(str, bench.THREADS)),
+        help="comma separated pool sizes",
+    )
+    threads.add_argument("--rounds", type=int, default=2)
+    threads.add_argument("--vectors", default=bench.VECTORS)
+    threads.add_argument("--synthetic", type=int, default=bench.SYNTHETIC)
+    threads.set_defaults(func=_threads)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,16 @@
 
 import hashlib
 from hashlib import sha256
-import hmac
-import struct
 import unicodedata
 from enum import IntEnum, unique
-from typing import List
-from functools import reduce
+from typing import List, Sequence, Union
 
 from util import (
     to_bytes,
-    strxor,
     BytesUtils,
     IntegerUtils,
 )
+from util.instrument import stage
 from bip39.data import wordlist
 
 
@@ -54,41 +51,38 @@ WORD_BIT_LEN: int = 11
 SEED_PBKDF2_ROUNDS: int = 2048
 
 
-def link(s, pw, prf):
-    s[0], s[1] = s[1], prf(pw, s[1])
-    return s[0]
-
-
+@stage("bip39.mnemonics_to_seed")
 def mnemonics_to_seed(seed, passphrase=b""):
-    salt = b"mnemonic" + passphrase
-
-    def prf(p, s):
-        hx = hmac.new(p, msg=s, digestmod=hashlib.sha512)
-        return hx.digest()
-
-    res = PBKDF2(password=seed, salt=salt, dkLen=64, prf=prf, count=2048)
-    return res
-
-
-def PBKDF2(password, salt, dkLen=16, count=1000, prf=None) -> bytes:
-    password = to_bytes(password)
-    salt = to_bytes(salt)
+    return hashlib.pbkdf2_hmac(
+        "sha512",
+        to_bytes(seed),
+        b"mnemonic" + to_bytes(passphrase),
+        SEED_PBKDF2_ROUNDS,
+    )
 
-    key = b""
-    i = 1
-    while len(key) < dkLen:
-        s = [prf(password, salt + struct.pack(">I", i))] * 2
-        key += reduce(strxor, (link(s, password, prf) for j in range(count)))
-        i += 1
 
-    return key[:dkLen]
+def mnemonics_to_seed_many(
+    seeds: Sequence, passphrases: Union[bytes, Sequence[bytes]] = b""
+) -> List[bytes]:
+    """
+    mnemonics_to_seed for a batch of candidates, in order.
+    passphrases is either one passphrase for all seeds or one per seed.
+    """
+    if isinstance(passphrases, bytes):
+        passphrases = [passphrases] * len(seeds)
+    if len(seeds) != len(passphrases):
+        raise ValueError("Expected one passphrase per seed")
+    return [
+        mnemonics_to_seed(seed, passphrase)
+        for seed, passphrase in zip(seeds, passphrases)
+    ]
 
 
 def validate_checksum(seed: List[str], n_words: Bip39WordsNum) -> bool:
     # __MnemonicToBinaryStr
     def get_bytes(word: str) -> str:
         wOpt = wordlist.get_word_idx_option(word)
-        if wOpt:
+        if wOpt is not None:
             return IntegerUtils.to_binary_str(wOpt, WORD_BIT_LEN)
         return ""
 
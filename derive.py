@@ -1,11 +1,118 @@
-"""Interactive application for deriving a Monero mnemonic from a BIP 39 seedphrase."""
+"""Interactive application for deriving a Monero mnemonic from a BIP 39 seedphrase.
 
-from curses import wrapper
-import ui
-from util import catch_sigint, lower_escdelay
+With --batch, converts mnemonic records without the TUI instead, see
+slip0010.batch for the record formats. --daemon serves conversions on a
+Unix socket, see slip0010.daemon, and --batch --socket uses it.
+--profile-startup reports the startup cost headlessly, see startup.
+"""
 
+import argparse
+import sys
+from contextlib import ExitStack
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        nargs="?",
+        const="-",
+        help="convert records from FILE (default: stdin) headlessly",
+    )
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument(
+        "-o", "--output", metavar="FILE", help="write to FILE, not stdout"
+    )
+    parser.add_argument(
+        "-j", "--processes", type=int, help="worker processes (default: all)"
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="emit results in completion order",
+    )
+    parser.add_argument(
+        "--addresses", action="store_true", help="include the main address"
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["pickle", "shm"],
+        default="pickle",
+        help="how workers return results (shm: shared memory records)",
+    )
+    parser.add_argument(
+        "--daemon",
+        metavar="SOCKET",
+        help="serve derivations on a Unix socket from warm workers",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="SOCKET",
+        help="with --batch, derive through the daemon on SOCKET",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        metavar="FORMAT",
+        nargs="?",
+        const="json",
+        choices=["json", "text"],
+        help="report import times and peak memory, exit 1 over budget",
+    )
+    return parser.parse_args(argv)
+
+
+def _batch(args) -> int:
+    from slip0010 import batch
+
+    with ExitStack() as files:
+        infile = sys.stdin
+        if args.batch != "-":
+            infile = files.enter_context(open(args.batch, newline=""))
+        outfile = sys.stdout
+        if args.output is not None:
+            outfile = files.enter_context(open(args.output, "w"))
+        failed = batch.run(
+            infile,
+            outfile,
+            args.format,
+            processes=args.processes,
+            ordered=not args.unordered,
+            addresses=args.addresses,
+            socket=args.socket,
+            transport=args.transport,
+        )
+    return 1 if failed else 0
+
+
+def _profile_startup(fmt) -> int:
+    import startup
+
+    report = startup.profile()
+    out = startup.to_text if fmt == "text" else startup.to_json
+    sys.stdout.write(out(report))
+    over = startup.over_budget(report)
+    for line in over:
+        print(f"over budget: {line}", file=sys.stderr)
+    return 1 if over else 0
+
+
+def __main__(argv=None):
+    args = _parse_args(argv)
+    if args.profile_startup is not None:
+        sys.exit(_profile_startup(args.profile_startup))
+    if args.daemon is not None:
+        from slip0010 import daemon
+
+        daemon.serve(args.daemon, processes=args.processes)
+        return
+    if args.batch is not None:
+        sys.exit(_batch(args))
+
+    from curses import wrapper
+    import ui
+    from util import catch_sigint, lower_escdelay
 
-def __main__():
     catch_sigint()
     lower_escdelay()
 
@@ -17,4 +124,5 @@ def __main__():
         print(e)
 
 
-__main__()
+if __name__ == "__main__":
+    __main__()
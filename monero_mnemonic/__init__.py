@@ -1,8 +1,11 @@
 from enum import IntEnum, unique
-from typing import List, Literal
-from binascii import crc32, hexlify
+import struct
+from typing import Iterable, List, Literal, Sequence, Union
+from binascii import crc32
+from operator import itemgetter
 
 from util import IntegerUtils, BytesUtils
+from util.instrument import stage
 from .data import wordlist
 
 n = wordlist.WORDS_LIST_NUM
@@ -48,48 +51,78 @@ def _is_valid_entropy_len(entropy_byte_len: bytes) -> bool:
     return entropy_byte_len * 8 in ENTROPY_BIT_LEN
 
 
-def mn_encode(message: bytes, checksum=False) -> List[str]:
-    def mn_swap_endian_4byte(st):
-        # this is from moneromoo's code
-        r = st[6:8] + st[4:6] + st[2:4] + st[0:2]
-        return r
-
-    def checksum_create(wlist, unique_prefix_len=wordlist.unique_prefix_length):
-        acc = ""
-        for w in wlist:
-            acc += w[:unique_prefix_len] if len(w) > unique_prefix_len else w
+_WORD = struct.Struct("<I")
+_PREFIXES = [w[: wordlist.unique_prefix_length] for w in wordlist.wordlist]
 
-        acc = acc.encode("utf8")
-        crc = crc32(acc) & 0xFFFFFFFF
-        return crc % len(wlist)
 
-    out = []
-    n = wordlist.WORDS_LIST_NUM
-    message = hexlify(message)
-    for i in range(0, len(message), 8):
-        message = (
-            message[0:i]
-            + mn_swap_endian_4byte(message[i : i + 8])
-            + message[i + 8 :]
+@stage("mn_encode")
+def mn_encode(message: bytes, checksum=False) -> List[str]:
+    """
+    Encode a message of little-endian uint32 words, 3 mnemonic words each.
+    With checksum, the word picked by the CRC32 of the unique prefixes is
+    appended.
+    """
+    if len(message) % _WORD.size:
+        raise ValueError(
+            f"Message length ({len(message)}) is not a multiple of 4"
         )
-
-    for i in range(len(message) // 8):
-        word = message[8 * i : 8 * i + 8]
-        x = int(word, 16)
+    out = []
+    prefixes = []
+    for (x,) in _WORD.iter_unpack(message):
         w1 = x % n
-        w2 = ((x // n) + w1) % n
-        w3 = (((x // n) // n) + w2) % n
-        word1 = wordlist[w1]
-        word2 = wordlist[w2]
-        word3 = wordlist[w3]
-        out += [word1, word2, word3]
+        w2 = (x // n + w1) % n
+        w3 = (x // n // n + w2) % n
+        out += [wordlist[w1], wordlist[w2], wordlist[w3]]
+        if checksum:
+            prefixes += [_PREFIXES[w1], _PREFIXES[w2], _PREFIXES[w3]]
 
     if checksum:
-        idx = checksum_create(out)
-        out.append(out[idx])
+        crc = crc32("".join(prefixes).encode("utf8")) & 0xFFFFFFFF
+        out.append(out[crc % len(out)])
     return out
 
 
+def mn_encode_many(
+    messages: Iterable[bytes], checksum=False
+) -> List[List[str]]:
+    """
+    mn_encode over a batch of messages. The words of the whole batch are
+    computed from one unpack of the concatenated messages and looked up
+    in one go, only the checksums are per message.
+    """
+    messages = list(messages)
+    for message in messages:
+        if len(message) % _WORD.size:
+            raise ValueError(
+                f"Message length ({len(message)}) is not a multiple of 4"
+            )
+    idxs: List[int] = []
+    for (x,) in _WORD.iter_unpack(b"".join(messages)):
+        w1 = x % n
+        w2 = (x // n + w1) % n
+        idxs += (w1, w2, (x // n // n + w2) % n)
+    if not idxs:
+        return [[] for _ in messages]
+    words = _lookup(idxs, wordlist.wordlist)
+    out = []
+    start = 0
+    for message in messages:
+        end = start + len(message) // _WORD.size * 3
+        phrase = list(words[start:end])
+        if checksum:
+            prefixes = _lookup(idxs[start:end], _PREFIXES)
+            crc = crc32("".join(prefixes).encode("utf8")) & 0xFFFFFFFF
+            phrase.append(phrase[crc % len(phrase)])
+        out.append(phrase)
+        start = end
+    return out
+
+
+def _lookup(idxs: List[int], table: Sequence[str]) -> Sequence[str]:
+    # itemgetter returns a bare item, not a tuple, for a single index
+    return itemgetter(*idxs)(table) if len(idxs) > 1 else (table[idxs[0]],)
+
+
 def encode(entropy_bytes: bytes) -> List[str]:
     """
     Encode bytes to list of mnemonic words.
@@ -147,20 +180,72 @@ def encode_int(seed: int) -> List[str]:
 #     return " ".join(out)
 
 
+def _word_idx(word: str) -> int:
+    """Index of a full word or of its unique prefix"""
+    idx = wordlist.get_word_idx_option(word)
+    if idx is None:
+        full = wordlist.unique_prefixes.get(
+            word[: wordlist.unique_prefix_length]
+        )
+        if full is None:
+            raise ValueError(f"Invalid mnemonic word ({word!r})")
+        idx = wordlist.m_words_to_idx[full]
+    return idx
+
+
+def mn_decode(words: Union[str, Sequence[str]]) -> bytes:
+    """
+    Decode 12, 13, 24 or 25 mnemonic words (or their unique prefixes) to
+    the seed bytes. The 13th/25th word is verified as the checksum.
+
+    Raises:
+        ValueError: On unknown words, a bad length or checksum
+    """
+    values = _decode_values(words)
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+def _decode_values(words: Union[str, Sequence[str]]) -> List[int]:
+    """The uint32 words of the seed mn_decode decodes words to"""
+    if isinstance(words, str):
+        words = words.split()
+    if len(words) not in (12, 13, 24, 25):
+        raise ValueError(f"Invalid mnemonic length ({len(words)})")
+    idxs = [_word_idx(w) for w in words]
+    if len(words) % 3:
+        pl = wordlist.unique_prefix_length
+        expected = get_checksum([wordlist[i] for i in idxs])
+        if wordlist[idxs[-1]][:pl] != expected[:pl]:
+            raise ValueError("Invalid mnemonic checksum")
+        idxs.pop()
+
+    values = []
+    for i in range(0, len(idxs), 3):
+        w1, w2, w3 = idxs[i : i + 3]
+        x = w1 + n * ((w2 - w1) % n) + n * n * ((w3 - w2) % n)
+        if x > 0xFFFFFFFF:
+            raise ValueError("Invalid mnemonic word triplet")
+        values.append(x)
+    return values
+
+
+def mn_decode_many(phrases: Iterable[Union[str, Sequence[str]]]) -> List[bytes]:
+    """
+    mn_decode over a batch of phrases, packed into one buffer that is
+    then sliced per phrase.
+    """
+    values: List[int] = []
+    ends = []
+    for words in phrases:
+        values += _decode_values(words)
+        ends.append(len(values) * _WORD.size)
+    packed = struct.pack(f"<{len(values)}I", *values)
+    return [packed[start:end] for start, end in zip([0] + ends, ends)]
+
+
 def decode(phrase: List[str]) -> str:
     """Calculate hexadecimal representation of the phrase."""
-    # phrase = phrase.split(" ")
-    out = ""
-
-    for i in range(len(phrase) // 3):
-        word1, word2, word3 = phrase[3 * i : 3 * i + 3]
-        w1 = wordlist.get_word_idx_unsafe(word1)
-        w2 = wordlist.get_word_idx_unsafe(word2) % n
-        w3 = wordlist.get_word_idx_unsafe(word3) % n
-        x = w1 + n * ((w2 - w1) % n) + n * n * ((w3 - w2) % n)
-        # out += f"%08{x}"
-        out += endian_swap(f"%08{x}")
-    return out
+    return mn_decode(phrase).hex()
 
 
 def endian_swap(word: str) -> str:
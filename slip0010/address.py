@@ -0,0 +1,36 @@
+"""Monero standard address encoding (Monero's block-wise base58)"""
+
+from slip0010.ed25519 import cn_fast_hash, encode_varint
+
+MAINNET = 18
+MAINNET_SUBADDRESS = 42
+
+_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_FULL_BLOCK = 8
+# encoded length of a block of 0..8 bytes
+_ENCODED_BLOCK = (0, 2, 3, 5, 6, 7, 9, 10, 11)
+
+
+def b58encode(data: bytes) -> str:
+    """
+    Monero base58: every 8-byte block maps to 11 characters, the last
+    partial block to a fixed shorter length.
+    """
+    out = []
+    for off in range(0, len(data), _FULL_BLOCK):
+        block = data[off : off + _FULL_BLOCK]
+        x = int.from_bytes(block, "big")
+        chars = []
+        for _ in range(_ENCODED_BLOCK[len(block)]):
+            x, r = divmod(x, 58)
+            chars.append(_ALPHABET[r])
+        out.append("".join(reversed(chars)))
+    return "".join(out)
+
+
+def encode_address(
+    spend_pub: bytes, view_pub: bytes, net_byte: int = MAINNET
+) -> str:
+    """Base58 address of a (spend, view) public key pair"""
+    data = encode_varint(net_byte) + bytes(spend_pub) + bytes(view_pub)
+    return b58encode(data + cn_fast_hash(data)[:4])
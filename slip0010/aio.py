@@ -0,0 +1,119 @@
+"""asyncio facade over SeedDerivation.derive_monero
+
+The derivation runs in an executor, one stage at a time, so the event
+loop stays responsive and a cancelled task stops at the next stage:
+
+    seed (PBKDF2) -> Monero master (wallet walk) -> keys (curve ops)
+
+Threads (the loop's default executor) keep the loop responsive; pass a
+ProcessPoolExecutor, e.g. slip0010.pool.executor(), to also derive in
+parallel.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import bip39
+from slip0010.sd import DEFAULT_SLIP0010_PATH, SeedDerivation
+
+Records = Union[Iterable[Tuple[str, str]], AsyncIterable[Tuple[str, str]]]
+
+
+def _seed_stage(mnem: str, passp: str) -> bytes:
+    return bip39.mnemonics_to_seed(mnem, passphrase=passp.encode("utf8"))
+
+
+def _master_stage(seed: bytes) -> bytes:
+    return SeedDerivation.from_master_seed(seed, slip0010=True).monero_master
+
+
+def _keys_stage(monero_master: bytes) -> SeedDerivation:
+    sd = SeedDerivation.from_monero_seed(monero_master)
+    # computed here so that they travel back cached
+    _ = sd.electrum_words, sd.spend_pub, sd.view_pub
+    return sd
+
+
+async def derive_monero_async(
+    mnem: str,
+    passp: str,
+    executor: Optional[Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> SeedDerivation:
+    """
+    Awaitable SeedDerivation.derive_monero. With a semaphore, at most
+    its value of derivations run at once.
+    """
+    if semaphore is not None:
+        async with semaphore:
+            return await derive_monero_async(mnem, passp, executor)
+    loop = asyncio.get_running_loop()
+    seed = await loop.run_in_executor(executor, _seed_stage, mnem, passp)
+    master = await loop.run_in_executor(executor, _master_stage, seed)
+    sd = await loop.run_in_executor(executor, _keys_stage, master)
+    sd.mnemonics = SeedDerivation.clean_input(mnem)
+    sd.master_seed = seed
+    sd.is_slip0010 = True
+    sd.path = DEFAULT_SLIP0010_PATH
+    return sd
+
+
+async def _aiter(records: Records) -> AsyncIterator[Tuple[str, str]]:
+    if isinstance(records, AsyncIterable):
+        async for rec in records:
+            yield rec
+    else:
+        for rec in records:
+            yield rec
+
+
+async def derive_monero_many(
+    records: Records,
+    executor: Optional[Executor] = None,
+    concurrency: int = 4,
+    ordered: bool = False,
+) -> AsyncIterator[Tuple[int, SeedDerivation]]:
+    """
+    Derives (mnemonic, passphrase) records with at most concurrency in
+    flight, yielding (input index, SeedDerivation) in completion or,
+    if ordered, input order. Records are only read as results are taken.
+    A failed derivation raises; closing the iterator or cancelling its
+    consumer cancels the derivations still in flight.
+    """
+    pending: Deque[asyncio.Task] = deque()
+    index = 0
+
+    async def run(i: int, mnem: str, passp: str):
+        return i, await derive_monero_async(mnem, passp, executor)
+
+    async def take():
+        if ordered:
+            return await pending.popleft()
+        done, _ = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        task = done.pop()
+        pending.remove(task)
+        return task.result()
+
+    try:
+        async for mnem, passp in _aiter(records):
+            pending.append(asyncio.ensure_future(run(index, mnem, passp)))
+            index += 1
+            if len(pending) >= concurrency:
+                yield await take()
+        while pending:
+            yield await take()
+    finally:
+        for task in pending:
+            task.cancel()
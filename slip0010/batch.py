@@ -0,0 +1,164 @@
+"""Headless batch conversion of BIP39 mnemonics to Monero keys
+
+Input records, as JSON lines or CSV with a header row:
+
+    {"mnemonic": "<bip39 words>", "passphrase": "<optional>"}
+
+    mnemonic,passphrase
+    <bip39 words>,<optional>
+
+Every output record is one JSON line carrying the 0-based input index,
+so results streamed in completion order can be matched up again:
+
+    {"index": 0, "electrum_words": "...", "spend_sec": "<hex>",
+     "spend_pub": "<hex>", "view_sec": "<hex>", "view_pub": "<hex>",
+     "address": "<base58>"}  # address only when requested
+
+Records that fail to convert yield {"index": i, "error": "..."}.
+"""
+
+import csv
+import json
+import os
+from functools import partial
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from bip39 import Bip39WordsNum, validate_checksum
+from bip39.data import wordlist
+from util import bounded_imap, bounded_imap_unordered
+from slip0010 import ed25519 as crypto
+from slip0010 import pool
+from slip0010.sd import SeedDerivation
+
+Record = Dict[str, Any]
+Job = Tuple[int, str, str]
+
+
+def read_records(f: TextIO, fmt: str = "jsonl") -> Iterator[Tuple[str, str]]:
+    """Streams (mnemonic, passphrase) pairs from a JSONL or CSV file."""
+    if fmt == "csv":
+        for row in csv.DictReader(f):
+            yield row["mnemonic"], row.get("passphrase") or ""
+        return
+    if fmt != "jsonl":
+        raise ValueError(f"Unknown input format ({fmt})")
+    for line in f:
+        line = line.strip()
+        if line:
+            rec = json.loads(line)
+            yield rec["mnemonic"], rec.get("passphrase", "")
+
+
+def _check_mnemonic(mnemonic: str) -> str:
+    """The mnemonic with prefixes expanded, as the TUI accepts it"""
+    words = []
+    for word in mnemonic.lower().split():
+        full = wordlist.resolve(word)
+        if full is None:
+            raise ValueError(f"Invalid word ({word})")
+        words.append(full)
+    if len(words) not in list(Bip39WordsNum):
+        raise ValueError(f"Invalid mnemonic length ({len(words)})")
+    if not validate_checksum(words, Bip39WordsNum(len(words))):
+        raise ValueError("Invalid mnemonic checksum")
+    return " ".join(words)
+
+
+def derive_job(job: Job) -> Union[SeedDerivation, Record]:
+    """The SeedDerivation of one job, or its error record"""
+    index, mnemonic, passphrase = job
+    try:
+        mnemonic = _check_mnemonic(mnemonic)
+        return SeedDerivation.derive_monero(mnemonic, passphrase)
+    except Exception as e:  # pylint: disable=W0718
+        return {"index": index, "error": f"{type(e).__name__}: {e}"}
+
+
+def derive_record(job: Job, addresses: bool = False) -> Record:
+    """Derives the Monero keys of one (index, mnemonic, passphrase) job."""
+    sd = derive_job(job)
+    if isinstance(sd, dict):
+        return sd
+    index = job[0]
+    rec = {
+        "index": index,
+        "electrum_words": sd.electrum_words,
+        "spend_sec": bytes(crypto.EdScalar(sd.spend_sec)).hex(),
+        "spend_pub": bytes(sd.spend_pub).hex(),
+        "view_sec": bytes(sd.view_sec).hex(),
+        "view_pub": bytes(sd.view_pub).hex(),
+    }
+    if addresses:
+        rec["address"] = sd.address
+    return rec
+
+
+def derive_records(
+    records: Iterable[Tuple[str, str]],
+    processes: Optional[int] = None,
+    ordered: bool = True,
+    addresses: bool = False,
+    window: Optional[int] = None,
+    socket: Optional[str] = None,
+    transport: str = "pickle",
+) -> Iterator[Record]:
+    """
+    Streams derive_record over (mnemonic, passphrase) pairs. At most
+    window records (default 4 per process) are in flight, the input is
+    only read as results are taken. processes=1 derives in-process,
+    socket sends the records to a slip0010.daemon instead.
+    transport="shm" has workers write results to shared memory rather
+    than pickling them back, see slip0010.ring.
+    """
+    if transport not in ("pickle", "shm"):
+        raise ValueError(f"Unknown transport ({transport})")
+    if socket is not None:
+        from slip0010.daemon import derive_records_remote
+
+        yield from derive_records_remote(
+            socket, records, ordered, addresses, window or 32
+        )
+        return
+    jobs = ((i, m, p) for i, (m, p) in enumerate(records))
+    func = partial(derive_record, addresses=addresses)
+    if processes == 1:
+        yield from map(func, jobs)
+        return
+    processes = processes or os.cpu_count() or 1
+    imap = bounded_imap if ordered else bounded_imap_unordered
+    if transport == "shm":
+        from slip0010.ring import derive_records_shm
+
+        yield from derive_records_shm(
+            jobs, processes, imap, addresses, window or 4 * processes
+        )
+        return
+    with pool.pool(processes) as workers:
+        yield from imap(workers, func, jobs, window or 4 * processes)
+
+
+def run(
+    infile: TextIO,
+    outfile: TextIO,
+    fmt: str = "jsonl",
+    **kwargs,
+) -> int:
+    """
+    Converts every record of infile to a JSON line on outfile, flushing
+    as it goes. Returns the number of records that failed.
+    """
+    failed = 0
+    for rec in derive_records(read_records(infile, fmt), **kwargs):
+        failed += "error" in rec
+        outfile.write(json.dumps(rec) + "\n")
+        outfile.flush()
+    return failed
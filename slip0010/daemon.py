@@ -0,0 +1,289 @@
+"""Local derivation daemon over a Unix domain socket
+
+Clients write one JSON request per line and read one JSON response per
+line, in completion order:
+
+    {"id": <any>, "mnemonic": "...", "passphrase": "...", "addresses": false}
+
+Responses are slip0010.batch records with "index" replaced by the
+request "id" (default: the request's line number on the connection).
+
+Worker processes are started once from a slip0010.pool executor, with
+the wordlists and ed25519 tables preloaded, and warmed up by one
+derivation each, so a request costs a few
+milliseconds of IPC instead of an interpreter start. Identical requests
+in flight share one derivation, and requests arriving together are
+sent to the pool in batches.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from slip0010 import pool
+from slip0010.batch import Record, derive_record
+
+WARMUP_MNEMONIC = " ".join(["abandon"] * 11 + ["about"])
+
+Key = Tuple[str, str, bool]
+
+
+def _warm_up() -> None:
+    derive_record((0, WARMUP_MNEMONIC, ""), addresses=True)
+
+
+def derive_batch(keys: List[Key]) -> List[Record]:
+    """Pool task: derive_record over a batch of requests"""
+    return [derive_record((0, m, p), addresses=a) for m, p, a in keys]
+
+
+class Daemon:
+    """
+    Serves derivations from a warm process pool. Requests are queued,
+    identical ones coalesced, and a batcher collects them for at most
+    batch_delay seconds, then splits them evenly over the workers, at
+    most batch_size per pool task.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        processes: Optional[int] = None,
+        batch_size: int = 16,
+        batch_delay: float = 0.002,
+        window: int = 64,
+    ):
+        self.path = path
+        self.processes = processes or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.window = window
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.inflight: Dict[Key, asyncio.Future] = {}
+        self.queue: Optional[asyncio.Queue] = None
+
+    async def derive(self, key: Key) -> Record:
+        """Derivation for key, shared with identical requests in flight"""
+        fut = self.inflight.get(key)
+        if fut is None:
+            assert self.queue is not None
+            fut = asyncio.get_running_loop().create_future()
+            self.inflight[key] = fut
+            fut.add_done_callback(lambda _: self.inflight.pop(key, None))
+            await self.queue.put((key, fut))
+        return dict(await asyncio.shield(fut))
+
+    async def _run_batch(self, batch, slots: asyncio.Semaphore) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            recs = await loop.run_in_executor(
+                self.pool, derive_batch, [key for key, _ in batch]
+            )
+            for (_, fut), rec in zip(batch, recs):
+                fut.set_result(rec)
+        except Exception as e:  # pylint: disable=W0718
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_result({"error": f"{type(e).__name__}: {e}"})
+        finally:
+            slots.release()
+
+    async def _batcher(self) -> None:
+        assert self.queue is not None
+        loop = asyncio.get_running_loop()
+        # two batches per worker keep the pool busy without queueing deep
+        slots = asyncio.Semaphore(2 * self.processes)
+        while True:
+            pending = [await self.queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(pending) < self.batch_size * self.processes:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                    else:
+                        item = self.queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                pending.append(item)
+            # an even share per worker: batching only saves IPC, a burst
+            # in one batch would run on one worker while the others idle
+            size = min(self.batch_size, -(-len(pending) // self.processes))
+            for i in range(0, len(pending), size):
+                await slots.acquire()
+                batch = pending[i : i + size]
+                asyncio.ensure_future(self._run_batch(batch, slots))
+
+    @staticmethod
+    async def _write(rec: Record, writer, lock: asyncio.Lock) -> None:
+        async with lock:
+            writer.write(json.dumps(rec).encode("utf8") + b"\n")
+            await writer.drain()
+
+    async def _respond(self, req_id, key, writer, lock, window) -> None:
+        try:
+            rec = await self.derive(key)
+            rec.pop("index", None)
+            rec["id"] = req_id
+            await self._write(rec, writer, lock)
+        except ConnectionError:
+            pass
+        finally:
+            window.release()
+
+    async def handle(self, reader, writer) -> None:
+        """One client connection, at most window requests in flight"""
+        lock = asyncio.Lock()
+        window = asyncio.Semaphore(self.window)
+        tasks = set()
+        line_no = 0
+        try:
+            while True:
+                await window.acquire()
+                line = await reader.readline()
+                if not line:
+                    window.release()
+                    break
+                if not line.strip():
+                    window.release()
+                    continue
+                req = None
+                try:
+                    req = json.loads(line)
+                    key = (
+                        req["mnemonic"],
+                        req.get("passphrase", ""),
+                        bool(req.get("addresses", False)),
+                    )
+                except (ValueError, KeyError, TypeError) as e:
+                    req_id = line_no
+                    if isinstance(req, dict):
+                        req_id = req.get("id", line_no)
+                    rec = {"id": req_id, "error": f"Bad request: {e}"}
+                    window.release()
+                    line_no += 1
+                    try:
+                        await self._write(rec, writer, lock)
+                    except ConnectionError:
+                        break
+                    continue
+                task = asyncio.ensure_future(
+                    self._respond(
+                        req.get("id", line_no), key, writer, lock, window
+                    )
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                line_no += 1
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                # the client went away first, nothing left to report to
+                pass
+
+    async def serve(self, ready: Optional[asyncio.Event] = None) -> None:
+        """Serves until cancelled, then removes the socket."""
+        self.queue = asyncio.Queue()
+        self.pool = pool.executor(self.processes, initializer=_warm_up)
+        loop = asyncio.get_running_loop()
+        # start every worker now rather than on the first requests
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self.pool, derive_batch, [])
+                for _ in range(self.processes)
+            )
+        )
+        batcher = asyncio.ensure_future(self._batcher())
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self.handle, self.path)
+        try:
+            if ready is not None:
+                ready.set()
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+def serve(path: str, **kwargs) -> None:
+    """Runs a Daemon on path until interrupted or terminated."""
+
+    async def main():
+        task = asyncio.current_task()
+        assert task is not None
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, task.cancel
+        )
+        try:
+            await Daemon(path, **kwargs).serve()
+        except asyncio.CancelledError:
+            pass
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+def request(
+    path: str,
+    records: Iterable[Dict[str, Any]],
+    window: int = 32,
+) -> Iterator[Record]:
+    """
+    Sends request records to a daemon and yields the responses in
+    completion order, with at most window requests outstanding.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        rfile = sock.makefile("rb")
+        outstanding = 0
+        for rec in records:
+            sock.sendall(json.dumps(rec).encode("utf8") + b"\n")
+            outstanding += 1
+            if outstanding >= window:
+                yield json.loads(rfile.readline())
+                outstanding -= 1
+        sock.shutdown(socket.SHUT_WR)
+        for line in rfile:
+            yield json.loads(line)
+
+
+def derive_records_remote(
+    path: str,
+    records: Iterable[Tuple[str, str]],
+    ordered: bool = True,
+    addresses: bool = False,
+    window: int = 32,
+) -> Iterator[Record]:
+    """slip0010.batch.derive_records served by the daemon on path"""
+    reqs = (
+        {"id": i, "mnemonic": m, "passphrase": p, "addresses": addresses}
+        for i, (m, p) in enumerate(records)
+    )
+    done: Dict[int, Record] = {}
+    head = 0
+    for rec in request(path, reqs, window):
+        rec["index"] = rec.pop("id")
+        if not ordered:
+            yield rec
+            continue
+        # at most window responses wait here for an earlier one
+        done[rec["index"]] = rec
+        while head in done:
+            yield done.pop(head)
+            head += 1
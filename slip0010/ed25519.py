@@ -1,8 +1,9 @@
 import binascii
-from typing import Tuple
+from typing import Dict, List, Sequence, Tuple
 
 from slip0010 import ed25519_2
 from slip0010 import keccak2
+from util.instrument import stage
 
 b = 256
 q = 2**255 - 19
@@ -222,6 +223,18 @@ def generate_monero_keys(seed: Sc25519) -> Tuple[Sc25519, Ge25519]:
     return spend_sec, spend_pub  # , view_sec, view_pub
 
 
+def generate_view_keys(spend_sec) -> Tuple[Sc25519, Ge25519]:
+    """
+    Generates the view key pair from the spend secret, as Monero does for
+    deterministic wallets: view_sec = sc_reduce32(cn_fast_hash(spend_sec)).
+    :param spend_sec:
+    :return:
+    """
+    spend_sec = EdScalar.ensure_scalar(spend_sec)
+    return generate_keys(hash_to_scalar(bytes(spend_sec)))
+
+
+@stage("cn_fast_hash")
 def cn_fast_hash(buff):
     """
     Keccak 256, original one (before changes made in SHA3 standard)
@@ -231,3 +244,48 @@ def cn_fast_hash(buff):
     kc2 = keccak2.Keccak256()
     kc2.update(buff)
     return kc2.digest()
+
+
+def cn_fast_hash_many(buffers: Sequence[bytes]) -> List[bytes]:
+    """
+    cn_fast_hash of every buffer, in order.
+    Buffers of equal length are hashed together on NumPy lanes when NumPy
+    is available, otherwise this is the scalar path.
+    :param buffers:
+    :return:
+    """
+    try:
+        from slip0010.keccak_np import keccak256_many
+    except ImportError:
+        return [cn_fast_hash(buff) for buff in buffers]
+
+    by_len: Dict[int, List[int]] = {}
+    for i, buff in enumerate(buffers):
+        by_len.setdefault(len(buff), []).append(i)
+    out: List[bytes] = [b""] * len(buffers)
+    for idx in by_len.values():
+        if len(idx) == 1:
+            out[idx[0]] = cn_fast_hash(buffers[idx[0]])
+            continue
+        for i, h in zip(idx, keccak256_many([bytes(buffers[i]) for i in idx])):
+            out[i] = h
+    return out
+
+
+def encode_varint(n: int) -> bytes:
+    """Monero's LEB128-style varint"""
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def hash_to_scalar(buff) -> Sc25519:
+    """
+    H_s, cn_fast_hash reduced mod l (sc_reduce32)
+    :param buff:
+    :return:
+    """
+    return EdScalar(cn_fast_hash(buff))
@@ -34,7 +34,10 @@ import hashlib
 import operator
 import sys
 
-from typing import List, Any
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from util.instrument import stage
 
 __version__ = "1.0.dev0"
 
@@ -157,20 +160,51 @@ def scalarmult(P, e):
     return Q
 
 
-# Bpow[i] == scalarmult(B, 2**i)
-Bpow: List[Any] = []
-
+def scalarmult_many(Ps, e):
+    """
+    scalarmult(P, e) for every P in Ps.
 
-def make_Bpow():
+    Fixed 4-bit window, the digits of e are computed once for the batch.
+    """
+    if e == 0:
+        return [ident for _ in Ps]
+    digits = []
+    while e:
+        digits.append(e & 15)
+        e >>= 4
+    digits.reverse()
+    out = []
+    for P in Ps:
+        table = [ident, P]
+        for _ in range(14):
+            table.append(edwards_add(table[-1], P))
+        Q = table[digits[0]]
+        for digit in digits[1:]:
+            Q = edwards_double(
+                edwards_double(edwards_double(edwards_double(Q)))
+            )
+            if digit:
+                Q = edwards_add(Q, table[digit])
+        out.append(Q)
+    return out
+
+
+@stage("make_Bpow")
+def make_Bpow() -> Tuple[Any, ...]:
     P = B
+    Ps = []
     for i in range(253):
-        Bpow.append(P)
+        Ps.append(P)
         P = edwards_double(P)
+    return tuple(Ps)
 
 
-make_Bpow()
+# Bpow[i] == scalarmult(B, 2**i), built once and immutable so threads
+# can share it
+Bpow = make_Bpow()
 
 
+@stage("scalarmult_B")
 def scalarmult_B(e):
     """
     Implements scalarmult(B, e) more efficiently.
@@ -196,6 +230,7 @@ def encodeint(y):
     )
 
 
+@stage("encodepoint")
 def encodepoint(P):
     (x, y, z, t) = P
     zi = inv(z)
@@ -210,6 +245,37 @@ def encodepoint(P):
     )
 
 
+def batch_inv(zs):
+    """$= [z^{-1} \\mod q$ for z in zs], for all z != 0
+
+    Montgomery's trick: a single field inversion shared by the whole batch.
+    """
+    acc = 1
+    prefix = []
+    for z in zs:
+        prefix.append(acc)
+        acc = acc * z % q
+    acc = inv(acc)
+    out = [0] * len(zs)
+    for i in range(len(zs) - 1, -1, -1):
+        out[i] = prefix[i] * acc % q
+        acc = acc * zs[i] % q
+    return out
+
+
+def encodepoints(Ps):
+    """
+    Batch version of encodepoint, normalizing all points with one inversion.
+    """
+    zis = batch_inv([P[2] for P in Ps])
+    out = []
+    for (x, y, _, _), zi in zip(Ps, zis):
+        x = (x * zi) % q
+        y = (y * zi) % q
+        out.append((y | (x & 1) << (b - 1)).to_bytes(b // 8, "little"))
+    return out
+
+
 def bit(h, i):
     return (indexbytes(h, i // 8) >> (i % 8)) & 1
 
@@ -302,6 +368,120 @@ def checkvalid(s, m, pk):
         raise SignatureMismatch("signature does not pass verification")
 
 
+# Operation counting. count_ops() swaps counting wrappers in for the
+# module functions below, so they cost nothing outside of it. Field
+# multiplications (M), squarings (S) and multiplications by the curve
+# constant (D) are static costs of the formulas above; the square root
+# exponentiation in xrecover is counted as its own "sqrt" operation.
+_OP_COSTS = {
+    "edwards_add": {"add": 1, "M": 8, "D": 1},
+    "edwards_double": {"double": 1, "M": 4, "S": 4},
+    "inv": {"inv": 1, "M": 11, "S": 254},
+    "xrecover": {"sqrt": 1},
+}
+# Calls the counts are attributed to, the outermost one wins
+_OP_CALLERS = (
+    "scalarmult_B",
+    "scalarmult",
+    "scalarmult_many",
+    "encodepoint",
+    "encodepoints",
+    "decodepoint",
+)
+
+
+class OpCounts:
+    """Operation counts per high-level call, see count_ops"""
+
+    def __init__(self):
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.calls: Dict[str, int] = {}
+        self._stack: List[str] = []
+
+    def add(self, costs: Dict[str, int]) -> None:
+        caller = self._stack[0] if self._stack else "other"
+        counts = self.counts.setdefault(caller, {})
+        for op, n in costs.items():
+            counts[op] = counts.get(op, 0) + n
+
+    def cost_report(self) -> Dict[str, Dict[str, int]]:
+        """{caller: {"calls": n, op: count, ...}}, sorted by caller"""
+        return {
+            caller: dict(
+                sorted(counts.items()), calls=self.calls.get(caller, 0)
+            )
+            for caller, counts in sorted(self.counts.items())
+        }
+
+
+@contextmanager
+def count_ops() -> Iterator[OpCounts]:
+    """
+    Counts point additions, doublings, inversions and square roots, and
+    the field operations they imply, inside the block. Not thread-safe.
+    """
+    ops = OpCounts()
+    module = globals()
+    saved = {name: module[name] for name in (*_OP_COSTS, *_OP_CALLERS)}
+    saved["batch_inv"] = module["batch_inv"]
+
+    def counted(f, costs):
+        def _f(*args):
+            ops.add(costs)
+            return f(*args)
+
+        return _f
+
+    def caller(f, name):
+        def _f(*args):
+            ops.calls[name] = ops.calls.get(name, 0) + (not ops._stack)
+            ops._stack.append(name)
+            try:
+                return f(*args)
+            finally:
+                ops._stack.pop()
+
+        return _f
+
+    def counted_batch(f, per_item):
+        def _f(items):
+            ops.add({"M": per_item * len(items)})
+            return f(items)
+
+        return _f
+
+    for name, costs in _OP_COSTS.items():
+        module[name] = counted(saved[name], costs)
+    for name in _OP_CALLERS:
+        module[name] = caller(saved[name], name)
+    # prefix products, then two multiplications per element back
+    module["batch_inv"] = counted_batch(saved["batch_inv"], 3)
+    # normalizing x and y after the inversion
+    module["encodepoint"] = caller(
+        counted(saved["encodepoint"], {"M": 2}), "encodepoint"
+    )
+    module["encodepoints"] = caller(
+        counted_batch(saved["encodepoints"], 2), "encodepoints"
+    )
+    try:
+        yield ops
+    finally:
+        module.update(saved)
+
+
+def cost_report(func: Callable, *args) -> Dict[str, Dict[str, int]]:
+    """
+    OpCounts.cost_report of func(*args). The module's own functions are
+    looked up by name, so that e.g. cost_report(scalarmult_B, e) is
+    attributed to scalarmult_B.
+    """
+    name = getattr(func, "__name__", None)
+    by_name = name in _OP_CALLERS and globals()[name] is func
+    with count_ops() as ops:
+        (globals()[name] if by_name else func)(*args)
+    return ops.cost_report()
+
+
 if __name__ == "__main__":
     import base64
 
@@ -1,7 +1,4 @@
-import functools
-from copy import deepcopy
 from math import log
-from operator import xor
 
 # The Keccak-f round constants.
 RoundConstants = [
@@ -75,9 +72,124 @@ def multirate_padding(used_bytes, align_bytes):
         padlen = align_bytes
     # note: padding done in 'internal bit ordering', wherein LSB is leftmost
     if padlen == 1:
-        return [0x81]
+        return b"\x81"
     else:
-        return [0x01] + ([0x00] * (padlen - 2)) + [0x80]
+        return b"\x01" + bytes(padlen - 2) + b"\x80"
+
+
+# The state is kept flat: lane (x, y) is at index x + 5 * y.
+# Destination lane and rotation offset of the combined rho and pi steps,
+# indexed by source lane.
+PiLanes = [i // 5 + 5 * ((2 * (i % 5) + 3 * (i // 5)) % 5) for i in range(25)]
+RhoOffsets = [RotationConstants[i // 5][i % 5] for i in range(25)]
+
+M64 = Masks[64]
+
+
+def keccak_f1600(A):
+    """
+    Keccak-f[1600] on a flat list of 25 64-bit lanes, in place.
+    Rounds are unrolled over the lanes, see keccak_f for the generic form.
+    """
+    a0, a1, a2, a3, a4 = A[0:5]
+    a5, a6, a7, a8, a9 = A[5:10]
+    a10, a11, a12, a13, a14 = A[10:15]
+    a15, a16, a17, a18, a19 = A[15:20]
+    a20, a21, a22, a23, a24 = A[20:25]
+    for rc in RoundConstants:
+        # theta
+        c0 = a0 ^ a5 ^ a10 ^ a15 ^ a20
+        c1 = a1 ^ a6 ^ a11 ^ a16 ^ a21
+        c2 = a2 ^ a7 ^ a12 ^ a17 ^ a22
+        c3 = a3 ^ a8 ^ a13 ^ a18 ^ a23
+        c4 = a4 ^ a9 ^ a14 ^ a19 ^ a24
+        d0 = c4 ^ ((c1 << 1 | c1 >> 63) & M64)
+        d1 = c0 ^ ((c2 << 1 | c2 >> 63) & M64)
+        d2 = c1 ^ ((c3 << 1 | c3 >> 63) & M64)
+        d3 = c2 ^ ((c4 << 1 | c4 >> 63) & M64)
+        d4 = c3 ^ ((c0 << 1 | c0 >> 63) & M64)
+        # rho and pi
+        b0 = a0 ^ d0
+        t = a5 ^ d0
+        b16 = (t << 36 | t >> 28) & M64
+        t = a10 ^ d0
+        b7 = (t << 3 | t >> 61) & M64
+        t = a15 ^ d0
+        b23 = (t << 41 | t >> 23) & M64
+        t = a20 ^ d0
+        b14 = (t << 18 | t >> 46) & M64
+        t = a1 ^ d1
+        b10 = (t << 1 | t >> 63) & M64
+        t = a6 ^ d1
+        b1 = (t << 44 | t >> 20) & M64
+        t = a11 ^ d1
+        b17 = (t << 10 | t >> 54) & M64
+        t = a16 ^ d1
+        b8 = (t << 45 | t >> 19) & M64
+        t = a21 ^ d1
+        b24 = (t << 2 | t >> 62) & M64
+        t = a2 ^ d2
+        b20 = (t << 62 | t >> 2) & M64
+        t = a7 ^ d2
+        b11 = (t << 6 | t >> 58) & M64
+        t = a12 ^ d2
+        b2 = (t << 43 | t >> 21) & M64
+        t = a17 ^ d2
+        b18 = (t << 15 | t >> 49) & M64
+        t = a22 ^ d2
+        b9 = (t << 61 | t >> 3) & M64
+        t = a3 ^ d3
+        b5 = (t << 28 | t >> 36) & M64
+        t = a8 ^ d3
+        b21 = (t << 55 | t >> 9) & M64
+        t = a13 ^ d3
+        b12 = (t << 25 | t >> 39) & M64
+        t = a18 ^ d3
+        b3 = (t << 21 | t >> 43) & M64
+        t = a23 ^ d3
+        b19 = (t << 56 | t >> 8) & M64
+        t = a4 ^ d4
+        b15 = (t << 27 | t >> 37) & M64
+        t = a9 ^ d4
+        b6 = (t << 20 | t >> 44) & M64
+        t = a14 ^ d4
+        b22 = (t << 39 | t >> 25) & M64
+        t = a19 ^ d4
+        b13 = (t << 8 | t >> 56) & M64
+        t = a24 ^ d4
+        b4 = (t << 14 | t >> 50) & M64
+        # chi and iota
+        a0 = b0 ^ (~b1 & b2) ^ rc
+        a1 = b1 ^ (~b2 & b3)
+        a2 = b2 ^ (~b3 & b4)
+        a3 = b3 ^ (~b4 & b0)
+        a4 = b4 ^ (~b0 & b1)
+        a5 = b5 ^ (~b6 & b7)
+        a6 = b6 ^ (~b7 & b8)
+        a7 = b7 ^ (~b8 & b9)
+        a8 = b8 ^ (~b9 & b5)
+        a9 = b9 ^ (~b5 & b6)
+        a10 = b10 ^ (~b11 & b12)
+        a11 = b11 ^ (~b12 & b13)
+        a12 = b12 ^ (~b13 & b14)
+        a13 = b13 ^ (~b14 & b10)
+        a14 = b14 ^ (~b10 & b11)
+        a15 = b15 ^ (~b16 & b17)
+        a16 = b16 ^ (~b17 & b18)
+        a17 = b17 ^ (~b18 & b19)
+        a18 = b18 ^ (~b19 & b15)
+        a19 = b19 ^ (~b15 & b16)
+        a20 = b20 ^ (~b21 & b22)
+        a21 = b21 ^ (~b22 & b23)
+        a22 = b22 ^ (~b23 & b24)
+        a23 = b23 ^ (~b24 & b20)
+        a24 = b24 ^ (~b20 & b21)
+
+    A[0:5] = a0, a1, a2, a3, a4
+    A[5:10] = a5, a6, a7, a8, a9
+    A[10:15] = a10, a11, a12, a13, a14
+    A[15:20] = a15, a16, a17, a18, a19
+    A[20:25] = a20, a21, a22, a23, a24
 
 
 def keccak_f(state):
@@ -85,49 +197,42 @@ def keccak_f(state):
     This is Keccak-f permutation.  It operates on and
     mutates the passed-in KeccakState.  It returns nothing.
     """
-
-    def round(A, RC):
-        W, H = state.W, state.H
-        rangeW, rangeH = state.rangeW, state.rangeH
-        lanew = state.lanew
-        zero = state.zero
-
+    lanew = state.lanew
+    if lanew == 64:
+        keccak_f1600(state.s)
+        return
+
+    A = state.s
+    B = [0] * 25
+    nr = 12 + 2 * int(log(lanew, 2))
+    for ir in range(nr):
         # theta
-        C = [functools.reduce(xor, A[x]) for x in rangeW]
-        D = [0] * W
-        for x in rangeW:
-            D[x] = C[(x - 1) % W] ^ rol(C[(x + 1) % W], 1, lanew)
-            for y in rangeH:
-                A[x][y] ^= D[x]
+        C = [
+            A[x] ^ A[x + 5] ^ A[x + 10] ^ A[x + 15] ^ A[x + 20]
+            for x in range(5)
+        ]
+        D = [C[x - 1] ^ rol(C[(x + 1) % 5], 1, lanew) for x in range(5)]
 
         # rho and pi
-        B = zero()
-        for x in rangeW:
-            for y in rangeH:
-                B[y % W][(2 * x + 3 * y) % H] = rol(
-                    A[x][y], RotationConstants[y][x], lanew
-                )
+        for i in range(25):
+            B[PiLanes[i]] = rol(A[i] ^ D[i % 5], RhoOffsets[i], lanew)
 
         # chi
-        for x in rangeW:
-            for y in rangeH:
-                A[x][y] = B[x][y] ^ ((~B[(x + 1) % W][y]) & B[(x + 2) % W][y])
+        for y in range(0, 25, 5):
+            for x in range(5):
+                A[x + y] = B[x + y] ^ (
+                    (~B[(x + 1) % 5 + y]) & B[(x + 2) % 5 + y]
+                )
 
         # iota
-        A[0][0] ^= RC
-
-    l = int(log(state.lanew, 2))
-    nr = 12 + 2 * l
-
-    for ir in range(nr):
-        round(state.s, RoundConstants[ir])
+        A[0] ^= RoundConstants[ir]
 
 
 class KeccakState(object):
     """
     A keccak state container.
 
-    The state is stored as a 5x5 table of integers.
+    The state is stored as a flat list of 25 lanes, (x, y) at x + 5 * y.
     """
 
     W = 5
@@ -141,7 +246,7 @@ class KeccakState(object):
         """
         Returns an zero state table.
         """
-        return [[0] * KeccakState.W for x in KeccakState.rangeH]
+        return [0] * (KeccakState.W * KeccakState.H)
 
     @staticmethod
     def format(st):
@@ -156,7 +261,7 @@ class KeccakState(object):
         for y in KeccakState.rangeH:
             row = []
             for x in KeccakState.rangeW:
-                row.append(fmt(st[x][y]))
+                row.append(fmt(st[x + KeccakState.W * y]))
             rows.append(" ".join(row))
         return "\n".join(rows)
 
@@ -211,37 +316,53 @@ class KeccakState(object):
     def __str__(self):
         return KeccakState.format(self.s)
 
-    def absorb(self, bb):
+    def copy(self):
         """
-        Mixes in the given bitrate-length string to the state.
+        Clone of the state, copying only the lane list.
         """
-        assert len(bb) == self.bitrate_bytes
+        c = KeccakState.__new__(KeccakState)
+        c.__dict__.update(self.__dict__)
+        c.s = self.s[:]
+        return c
 
-        bb += [0] * bits2bytes(self.b - self.bitrate)
-        i = 0
+    def absorb(self, bb):
+        """
+        Mixes in the given bitrate-length block to the state.
+        bb may be any bytes-like object, lanes are read from it in place.
+        """
+        mv = memoryview(bb)
+        assert len(mv) == self.bitrate_bytes
 
-        for y in self.rangeH:
-            for x in self.rangeW:
-                self.s[x][y] ^= KeccakState.bytes2lane(bb[i : i + 8])
-                i += 8
+        s = self.s
+        for i, off in enumerate(range(0, self.bitrate_bytes, 8)):
+            s[i] ^= int.from_bytes(mv[off : off + 8], "little")
 
     def squeeze(self):
         """
         Returns the bitrate-length prefix of the state to be output.
         """
-        return self.get_bytes()[: self.bitrate_bytes]
+        out = bytearray(self.bitrate_bytes)
+        self.squeeze_into(memoryview(out))
+        return out
+
+    def squeeze_into(self, out):
+        """
+        Writes the bitrate-length prefix of the state to the writable
+        buffer out, truncated to its length.
+        """
+        n = min(len(out), self.bitrate_bytes)
+        for i, off in enumerate(range(0, n, 8)):
+            out[off : min(off + 8, n)] = self.s[i].to_bytes(8, "little")[
+                : n - off
+            ]
 
     def get_bytes(self):
         """
         Convert whole state to a byte string.
         """
-        out = [0] * bits2bytes(self.b)
-        i = 0
-        for y in self.rangeH:
-            for x in self.rangeW:
-                v = KeccakState.lane2bytes(self.s[x][y], self.lanew)
-                out[i : i + 8] = v
-                i += 8
+        out = bytearray(8 * len(self.s))
+        for i, lane in enumerate(self.s):
+            out[8 * i : 8 * i + 8] = lane.to_bytes(8, "little")
         return out
 
     def set_bytes(self, bb):
@@ -249,11 +370,8 @@ class KeccakState(object):
         Set whole state from byte string, which is assumed
         to be the correct length.
         """
-        i = 0
-        for y in self.rangeH:
-            for x in self.rangeW:
-                self.s[x][y] = KeccakState.bytes2lane(bb[i : i + 8])
-                i += 8
+        for i in range(len(self.s)):
+            self.s[i] = KeccakState.bytes2lane(bb[8 * i : 8 * i + 8])
 
 
 class KeccakSponge(object):
@@ -261,10 +379,15 @@ class KeccakSponge(object):
         self.state = KeccakState(bitrate, width)
         self.padfn = padfn
         self.permfn = permfn
-        self.buffer = []
+        self.buffer = bytearray()
 
     def copy(self):
-        return deepcopy(self)
+        c = KeccakSponge.__new__(KeccakSponge)
+        c.state = self.state.copy()
+        c.padfn = self.padfn
+        c.permfn = self.permfn
+        c.buffer = self.buffer[:]
+        return c
 
     def absorb_block(self, bb):
         assert len(bb) == self.state.bitrate_bytes
@@ -272,29 +395,53 @@ class KeccakSponge(object):
         self.permfn(self.state)
 
     def absorb(self, s):
-        self.buffer += KeccakState.str2bytes(s)
-
-        while len(self.buffer) >= self.state.bitrate_bytes:
-            self.absorb_block(self.buffer[: self.state.bitrate_bytes])
-            self.buffer = self.buffer[self.state.bitrate_bytes :]
+        """
+        Absorbs a bytes-like object. Whole blocks are read from it in place,
+        only a trailing partial block is kept in the buffer.
+        """
+        mv = memoryview(s).cast("B")
+        rate = self.state.bitrate_bytes
+        buf = self.buffer
+        if buf:
+            take = rate - len(buf)
+            buf += mv[:take]
+            mv = mv[take:]
+            if len(buf) < rate:
+                return
+            self.absorb_block(buf)
+            buf.clear()
+
+        end = len(mv) - len(mv) % rate
+        for off in range(0, end, rate):
+            self.absorb_block(mv[off : off + rate])
+        buf += mv[end:]
 
     def absorb_final(self):
         padded = self.buffer + self.padfn(
             len(self.buffer), self.state.bitrate_bytes
         )
         self.absorb_block(padded)
-        self.buffer = []
+        self.buffer = bytearray()
 
     def squeeze_once(self):
         rc = self.state.squeeze()
         self.permfn(self.state)
         return rc
 
-    def squeeze(self, l):
-        Z = self.squeeze_once()
-        while len(Z) < l:
-            Z += self.squeeze_once()
-        return Z[:l]
+    def squeeze(self, l, final=False):
+        """
+        Squeezes l bytes into a preallocated bytearray.
+        With final=True the state is not permuted after the last block,
+        which leaves the sponge unusable for further output.
+        """
+        out = bytearray(l)
+        mv = memoryview(out)
+        rate = self.state.bitrate_bytes
+        for off in range(0, l, rate):
+            self.state.squeeze_into(mv[off:])
+            if not final or off + rate < l:
+                self.permfn(self.state)
+        return out
 
 
 class KeccakHash:
@@ -336,7 +483,13 @@ class KeccakHash:
         return "<KeccakHash with r=%d, c=%d, image=%d>" % inf
 
     def copy(self):
-        return deepcopy(self)
+        """
+        Clone of the hash, e.g. to absorb a common prefix once and fork it.
+        """
+        c = KeccakHash.__new__(KeccakHash)
+        c.__dict__.update(self.__dict__)
+        c.sponge = self.sponge.copy()
+        return c
 
     def reset(self):
         self.sponge = KeccakSponge(
@@ -352,8 +505,7 @@ class KeccakHash:
     def digest(self, buff=None):
         finalised = self.sponge.copy()
         finalised.absorb_final()
-        digest = finalised.squeeze(self.digest_size)
-        res = KeccakState.bytes2str(digest)
+        res = bytes(finalised.squeeze(self.digest_size, final=True))
         if buff:
             for i in range(len(res)):
                 buff[i] = res[i]
@@ -0,0 +1,72 @@
+"""Lane-parallel Keccak-256 over many messages, on NumPy uint64 lanes
+
+Requires NumPy, see ed25519.cn_fast_hash_many for the guarded entry point.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+from slip0010.keccak2 import (
+    PiLanes,
+    RhoOffsets,
+    RoundConstants,
+    multirate_padding,
+)
+
+_RATE = 1088 // 8
+_RC = np.array(RoundConstants, dtype=np.uint64)
+_PI = np.array(PiLanes)
+_RHO_L = np.array(RhoOffsets, dtype=np.uint64)
+# shifting a uint64 by 64 is undefined, rotations by 0 shift right by 0
+_RHO_R = np.array([(64 - r) % 64 for r in RhoOffsets], dtype=np.uint64)
+_ONE = np.uint64(1)
+_63 = np.uint64(63)
+_X1 = [1, 2, 3, 4, 0]
+_X2 = [2, 3, 4, 0, 1]
+_XM1 = [4, 0, 1, 2, 3]
+
+
+def keccak_f1600_many(S: np.ndarray) -> None:
+    """
+    Keccak-f[1600] over the rows of an (N, 25) uint64 state, in place.
+    Lane (x, y) of each row is at x + 5 * y, as in keccak2.
+    """
+    S3 = S.reshape(-1, 5, 5)
+    B = np.empty_like(S)
+    B3 = B.reshape(-1, 5, 5)
+    for rc in _RC:
+        # theta
+        C = S3[:, 0] ^ S3[:, 1] ^ S3[:, 2] ^ S3[:, 3] ^ S3[:, 4]
+        C1 = C[:, _X1]
+        S3 ^= (C[:, _XM1] ^ ((C1 << _ONE) | (C1 >> _63)))[:, None, :]
+        # rho and pi
+        B[:, _PI] = (S << _RHO_L) | (S >> _RHO_R)
+        # chi
+        S3[:] = B3 ^ (~B3[:, :, _X1] & B3[:, :, _X2])
+        # iota
+        S[:, 0] ^= rc
+
+
+def keccak256_many(buffers: Sequence[bytes]) -> List[bytes]:
+    """
+    Keccak-256 (cn_fast_hash) of equal-length buffers, all at once.
+    """
+    n = len(buffers)
+    if n == 0:
+        return []
+    size = len(buffers[0])
+    if any(len(buf) != size for buf in buffers):
+        raise ValueError("Buffers must have equal length")
+
+    pad = multirate_padding(size % _RATE, _RATE)
+    msg = np.frombuffer(b"".join(buf + pad for buf in buffers), dtype="<u8")
+    blocks = msg.astype(np.uint64).reshape(n, -1, _RATE // 8)
+
+    S = np.zeros((n, 25), dtype=np.uint64)
+    for i in range(blocks.shape[1]):
+        S[:, : _RATE // 8] ^= blocks[:, i]
+        keccak_f1600_many(S)
+
+    out = S[:, :4].astype("<u8").tobytes()
+    return [out[32 * i : 32 * i + 32] for i in range(n)]
@@ -0,0 +1,145 @@
+"""Warm worker pools for multi-process derivation
+
+A cold worker spends its first fraction of a second importing the
+wordlists, building the ed25519 tables and probing hash backends, which
+dominates short jobs. The pools made here start workers with that state
+already built:
+
+    forkserver  the fork server imports PRELOAD once and every worker is
+                forked from it (the default, safe with threads running)
+    fork        the parent preloads and workers inherit it copy-on-write
+
+Either way the tables are shared between workers until written to. The
+initializer hook runs once per worker after that, and scratch() keeps
+per-worker objects alive from one job to the next.
+"""
+
+import gc
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from importlib import import_module
+from multiprocessing.context import BaseContext
+from multiprocessing.pool import Pool
+from typing import Any, Callable, Iterator, Optional, Sequence, TypeVar
+
+from util import hash160_backend
+
+T = TypeVar("T")
+
+PRELOAD = (
+    "bip39.data",
+    "monero_mnemonic.data",
+    "slip0010.ed25519_2",
+    "slip0010.sd",
+    "slip0010.batch",
+)
+
+_scratch = threading.local()
+
+
+def preload(modules: Sequence[str] = PRELOAD) -> None:
+    """Builds the shared state in this process."""
+    for name in modules:
+        import_module(name)
+    hash160_backend()
+
+
+def start_method() -> str:
+    """forkserver, or fork where that is missing or the binary is frozen"""
+    methods = multiprocessing.get_all_start_methods()
+    # a frozen binary cannot start the fork server's interpreter
+    if "forkserver" in methods and not getattr(sys, "frozen", False):
+        return "forkserver"
+    if "fork" in methods:
+        return "fork"
+    return "spawn"
+
+
+def context(method: Optional[str] = None) -> BaseContext:
+    """
+    A multiprocessing context whose workers start preloaded. The fork
+    server is shared by the whole process, its preload list only takes
+    effect if it is not running yet.
+    """
+    method = method or start_method()
+    ctx = multiprocessing.get_context(method)
+    if method == "forkserver":
+        ctx.set_forkserver_preload(["__main__", *PRELOAD])
+    else:
+        preload()
+    return ctx
+
+
+@contextmanager
+def _frozen(ctx: BaseContext) -> Iterator[None]:
+    """
+    With fork, moves everything out of the collector's reach while the
+    workers are forked, so that collecting in a worker does not write
+    to, and so copy, the pages of the preloaded objects. The parent's
+    objects are collectable again after.
+    """
+    if ctx.get_start_method() != "fork":
+        yield
+        return
+    gc.freeze()
+    try:
+        yield
+    finally:
+        gc.unfreeze()
+
+
+def _init_worker(initializer: Optional[Callable], initargs: tuple) -> None:
+    preload()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def pool(
+    processes: Optional[int] = None,
+    initializer: Optional[Callable] = None,
+    initargs: tuple = (),
+    method: Optional[str] = None,
+) -> Pool:
+    """A multiprocessing Pool of preloaded workers, see context"""
+    ctx = context(method)
+    # a Pool forks all its workers as it is made
+    with _frozen(ctx):
+        return ctx.Pool(
+            processes or os.cpu_count() or 1,
+            _init_worker,
+            (initializer, initargs),
+        )
+
+
+def executor(
+    processes: Optional[int] = None,
+    initializer: Optional[Callable] = None,
+    initargs: tuple = (),
+    method: Optional[str] = None,
+) -> ProcessPoolExecutor:
+    """
+    pool as a concurrent.futures executor. Its workers are forked on
+    first submit, so with fork they are not started frozen.
+    """
+    return ProcessPoolExecutor(
+        processes or os.cpu_count() or 1,
+        mp_context=context(method),
+        initializer=_init_worker,
+        initargs=(initializer, initargs),
+    )
+
+
+def scratch(key: Any, factory: Callable[[], T]) -> T:
+    """
+    The worker's object for key, made by factory on first use and reused
+    by later jobs. Objects are per thread, so a job may overwrite them.
+    """
+    objects = _scratch.__dict__
+    try:
+        return objects[key]
+    except KeyError:
+        return objects.setdefault(key, factory())
@@ -0,0 +1,140 @@
+"""Shared-memory result transport for batch derivation
+
+Workers write each result as one fixed-width record into a ring of
+slots in a multiprocessing.shared_memory block and send back only the
+slot number, so nothing but small integers is pickled. The parent turns
+a record into hex strings and words when it is taken, then frees the
+slot. Record layout, little-endian and unaligned, 320 bytes:
+
+    index       uint64
+    flags       uint8, HAS_ADDRESS
+    seed        32 bytes, the Monero master seed
+    spend_sec   32 bytes
+    spend_pub   32 bytes
+    view_sec    32 bytes
+    view_pub    32 bytes
+    words       25 uint16 indices into the Monero wordlist
+    address     95 ASCII bytes, when HAS_ADDRESS is set
+    padding     6 bytes
+
+Records that fail to convert are sent back pickled, as error records.
+"""
+
+import struct
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from monero_mnemonic.data import wordlist as monero_wordlist
+from slip0010 import ed25519 as crypto
+from slip0010 import pool
+from slip0010.batch import Job, Record, derive_job
+
+RECORD = struct.Struct("<QB32s32s32s32s32s25H95s6x")
+HAS_ADDRESS = 1
+
+# a worker's reply: the slot it filled and, on failure, the error record
+Reply = Tuple[int, Optional[Record]]
+
+
+class ResultRing:
+    """
+    slots records in shared memory. acquire() hands out a free slot for
+    a job, read() decodes a filled one and frees it.
+    """
+
+    def __init__(self, slots: int):
+        self.shm = SharedMemory(create=True, size=slots * RECORD.size)
+        self.free: List[int] = list(reversed(range(slots)))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def acquire(self) -> int:
+        return self.free.pop()
+
+    def release(self, slot: int) -> None:
+        self.free.append(slot)
+
+    def read(self, slot: int) -> Record:
+        """The record in slot as derive_record returns it"""
+        fields = RECORD.unpack_from(self.shm.buf, slot * RECORD.size)
+        self.release(slot)
+        index, flags = fields[:2]
+        _, spend_sec, spend_pub, view_sec, view_pub = fields[2:7]
+        words = fields[7:32]
+        rec = {
+            "index": index,
+            "electrum_words": " ".join(monero_wordlist[i] for i in words),
+            "spend_sec": spend_sec.hex(),
+            "spend_pub": spend_pub.hex(),
+            "view_sec": view_sec.hex(),
+            "view_pub": view_pub.hex(),
+        }
+        if flags & HAS_ADDRESS:
+            rec["address"] = fields[32].decode("ascii")
+        return rec
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "ResultRing":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def derive_into(
+    job: Tuple[int, str, str, int], name: str, addresses: bool = False
+) -> Reply:
+    """Pool task: derives an (index, mnemonic, passphrase, slot) job into
+    the slot of the ring called name."""
+    index, mnemonic, passphrase, slot = job
+    sd = derive_job((index, mnemonic, passphrase))
+    if isinstance(sd, dict):
+        return slot, sd
+    # attached once per worker and ring
+    shm = pool.scratch(("ring", name), lambda: SharedMemory(name))
+    words = [
+        monero_wordlist.m_words_to_idx[w] for w in sd.electrum_words.split()
+    ]
+    RECORD.pack_into(
+        shm.buf,
+        slot * RECORD.size,
+        index,
+        HAS_ADDRESS if addresses else 0,
+        sd.monero_master,
+        bytes(crypto.EdScalar(sd.spend_sec)),
+        bytes(sd.spend_pub),
+        bytes(sd.view_sec),
+        bytes(sd.view_pub),
+        *words,
+        sd.address.encode("ascii") if addresses else b"",
+    )
+    return slot, None
+
+
+def derive_records_shm(
+    jobs: Iterable[Job],
+    processes: int,
+    imap: Callable,
+    addresses: bool,
+    window: int,
+) -> Iterator[Record]:
+    """
+    slip0010.batch.derive_records over a ResultRing of window slots;
+    imap is bounded_imap or bounded_imap_unordered. A slot is taken when
+    its job is submitted, so at most window are ever in use.
+    """
+    with ResultRing(window) as ring, pool.pool(processes) as workers:
+        func = partial(derive_into, name=ring.name, addresses=addresses)
+        slotted = ((*job, ring.acquire()) for job in jobs)
+        for slot, error in imap(workers, func, slotted, window):
+            if error is not None:
+                ring.release(slot)
+                yield error
+            else:
+                yield ring.read(slot)
@@ -0,0 +1,300 @@
+"""Output ownership scanning over locally dumped transactions
+
+Input records, one per transaction, as a JSON array or JSON lines:
+
+    {
+        "tx_hash": "<hex>",
+        "tx_pubkey": "<hex>",
+        "additional_pubkeys": ["<hex>", ...],  # optional
+        "outputs": [{"index": 0, "key": "<hex>"}, ...]
+    }
+"""
+
+import os
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from binascii import unhexlify
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+from util import bounded_imap
+from slip0010 import ed25519_2
+from slip0010.ed25519 import (
+    EdScalar,
+    cn_fast_hash,
+    encode_varint,
+    generate_view_keys,
+    l,
+)
+from slip0010.pool import pool
+from slip0010.subaddress import SubaddressGenerator
+
+SpendKeys = Dict[bytes, Tuple[int, int]]
+
+
+@dataclass
+class OwnedOutput:
+    tx_hash: str
+    output_index: int
+    key: str
+    major: int
+    minor: int
+
+
+def _decodepoint(key: bytes) -> Optional[Tuple]:
+    """The point key encodes, None if it is not a valid encoding"""
+    try:
+        return ed25519_2.decodepoint(key)
+    except (ValueError, IndexError):
+        return None
+
+
+def _array_items(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    The items of a JSON array read from f, which is positioned after its
+    opening bracket, decoded one at a time as they are read.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    # what may come next: an item or "]" first, then "," or "]"
+    after_item = False
+    while True:
+        while pos < len(buf) and buf[pos].isspace():
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                raise ValueError("Unterminated JSON array")
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+            continue
+        if buf[pos] == "]":
+            return
+        if after_item:
+            if buf[pos] != ",":
+                raise ValueError(
+                    f"Expected ',' in JSON array, got {buf[pos]!r}"
+                )
+            pos += 1
+            after_item = False
+            continue
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # the item is cut off at the end of buf
+            more = f.read(chunk_size)
+            buf, pos, eof = buf[pos:] + more, 0, not more
+            continue
+        yield item
+        pos = end
+        after_item = True
+
+
+def read_transactions(path: str) -> Iterator[Dict[str, Any]]:
+    """Streams transaction records from a JSON array or JSON lines file."""
+    with open(path, encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        if head == "[":
+            yield from _array_items(f)
+            return
+        f.seek(0)
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+class OutputScanner:
+    """
+    Checks outputs against a set of (sub)address spend public keys:
+
+        derivation = 8*a*R
+        D = P - H_s(derivation || varint(index))*G
+
+    the output is owned if D is one of the spend keys. Keys off the
+    curve are not rejected on chain, so like wallet2 tx public keys,
+    additional public keys and output keys that do not decode are
+    skipped, and the outputs are still checked against the other keys.
+    """
+
+    def __init__(
+        self,
+        view_sec: EdScalar,
+        spend_keys: SpendKeys,
+        cache_size: int = 4096,
+    ):
+        self.view_sec = EdScalar.ensure_scalar(view_sec)
+        self.spend_keys = spend_keys
+        self.cache_size = cache_size
+        self._derivations: OrderedDict = OrderedDict()
+
+    @classmethod
+    def from_spend_sec(
+        cls,
+        spend_sec,
+        majors: range = range(1),
+        minors: range = range(1),
+        **kwargs,
+    ) -> "OutputScanner":
+        """
+        Scanner for the wallet of a spend secret, e.g.
+        SeedDerivation.spend_sec, over the given subaddress grid.
+        """
+        view_sec, _ = generate_view_keys(spend_sec)
+        spend_pub = ed25519_2.scalarmult_B(EdScalar.ensure_scalar(spend_sec).v)
+        gen = SubaddressGenerator(view_sec, ed25519_2.encodepoint(spend_pub))
+        spend_keys = {D: (i, j) for i, j, D, _ in gen.generate(majors, minors)}
+        return cls(view_sec, spend_keys, **kwargs)
+
+    def derivations(self, tx_pubkeys: List[bytes]) -> List[Optional[bytes]]:
+        """
+        Key derivations for tx_pubkeys, cached per public key. None for
+        keys that do not decode to a point.
+        """
+        cache = self._derivations
+        missing = []
+        points = []
+        for R in dict.fromkeys(tx_pubkeys):
+            if R in cache:
+                continue
+            P = _decodepoint(R)
+            if P is None:
+                cache[R] = None
+            else:
+                missing.append(R)
+                points.append(P)
+        if missing:
+            points = ed25519_2.scalarmult_many(points, self.view_sec.v)
+            points = [
+                ed25519_2.edwards_double(
+                    ed25519_2.edwards_double(ed25519_2.edwards_double(P))
+                )
+                for P in points
+            ]
+            for R, der in zip(missing, ed25519_2.encodepoints(points)):
+                cache[R] = der
+        out = []
+        for R in tx_pubkeys:
+            cache.move_to_end(R)
+            out.append(cache[R])
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return out
+
+    def scan(self, txs: Iterable[Dict[str, Any]]) -> List[OwnedOutput]:
+        """Owned outputs of txs, in input order."""
+        txs = list(txs)
+        pubkeys = []
+        for tx in txs:
+            pubkeys.append(unhexlify(tx["tx_pubkey"]))
+            pubkeys.extend(
+                unhexlify(R) for R in tx.get("additional_pubkeys", [])
+            )
+        derivations = dict(zip(pubkeys, self.derivations(pubkeys)))
+
+        candidates = []
+        points = []
+        for t, tx in enumerate(txs):
+            main = derivations[unhexlify(tx["tx_pubkey"])]
+            additional = [
+                derivations[unhexlify(R)]
+                for R in tx.get("additional_pubkeys", [])
+            ]
+            for pos, out in enumerate(tx["outputs"]):
+                index = out.get("index", pos)
+                options = [main]
+                if index < len(additional):
+                    options.append(additional[index])
+                options = [der for der in options if der is not None]
+                if not options:
+                    continue
+                P = _decodepoint(unhexlify(out["key"]))
+                if P is None:
+                    continue
+                for der in options:
+                    s = EdScalar(cn_fast_hash(der + encode_varint(index))).v
+                    D = ed25519_2.edwards_add(P, ed25519_2.scalarmult_B(l - s))
+                    candidates.append(
+                        (t, (tx.get("tx_hash", ""), index, out["key"]))
+                    )
+                    points.append(D)
+
+        owned = []
+        # an output matched by both derivations counts once; keyed on the
+        # position of the tx, as tx_hash is optional
+        seen = set()
+        for (t, cand), D in zip(candidates, ed25519_2.encodepoints(points)):
+            sub = self.spend_keys.get(D)
+            if sub is not None and (t, cand[1]) not in seen:
+                seen.add((t, cand[1]))
+                owned.append(OwnedOutput(*cand, *sub))
+        return owned
+
+
+_worker: Optional[OutputScanner] = None
+
+
+def _init_worker(view_sec: int, spend_keys: SpendKeys, cache_size: int):
+    global _worker  # pylint: disable=W0603
+    _worker = OutputScanner(view_sec, spend_keys, cache_size)
+
+
+def _scan_chunk(txs: List[Dict[str, Any]]) -> List[OwnedOutput]:
+    assert _worker is not None
+    return _worker.scan(txs)
+
+
+def _chunks(it: Iterable, n: int) -> Iterator[List]:
+    it = iter(it)
+    while True:
+        chunk = list(islice(it, n))
+        if not chunk:
+            return
+        yield chunk
+
+
+def scan_transactions(
+    txs: Iterable[Dict[str, Any]],
+    scanner: OutputScanner,
+    processes: Optional[int] = None,
+    chunk_size: int = 256,
+) -> Iterator[OwnedOutput]:
+    """
+    Streams the owned outputs of txs, in input order.
+    processes=1 scans in-process, otherwise a Pool of that size is used.
+    """
+    chunks = _chunks(txs, chunk_size)
+    if processes == 1:
+        for chunk in chunks:
+            yield from scanner.scan(chunk)
+        return
+    processes = processes or os.cpu_count() or 1
+    initargs = (scanner.view_sec.v, scanner.spend_keys, scanner.cache_size)
+    with pool(processes, _init_worker, initargs) as workers:
+        for owned in bounded_imap(workers, _scan_chunk, chunks, 2 * processes):
+            yield from owned
+
+
+def scan_file(
+    path: str,
+    scanner: OutputScanner,
+    processes: Optional[int] = None,
+    chunk_size: int = 256,
+) -> Iterator[OwnedOutput]:
+    """scan_transactions over a dump file, see read_transactions"""
+    return scan_transactions(
+        read_transactions(path), scanner, processes, chunk_size
+    )
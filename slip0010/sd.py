@@ -1,4 +1,5 @@
 import binascii
+from functools import cached_property
 
 import bip39
 from slip0010.wallet import Wallet
@@ -24,30 +25,43 @@ def decodeint(x, offset=0):
 
 
 class SeedDerivation(object):
+    """
+    Derivation stages, each a lazily computed and cached property:
+
+        master_seed -> wallet -> path_node -> pre_hash -> monero_master
+            -> electrum_words
+            -> spend_sec, spend_pub -> view_sec, view_pub -> address
+
+    so e.g. reading only electrum_words never multiplies a point, and
+    the BIP39 PBKDF2 behind master_seed only runs once a stage needs it.
+    set_mnemonics, set_seed and set_monero_seed reset the stages after
+    their input.
+    """
+
+    _STAGES = (
+        "wallet",
+        "path_node",
+        "pre_hash",
+        "monero_master",
+        "electrum_words",
+        "_spend_keys",
+        "_view_keys",
+        "address",
+    )
+
     def __init__(self):
         self.mnemonics = None
         self.mnemonics_as_idx = False
-        self.master_seed = None
-        self.pre_hash = None
-        self.monero_master = None
-        self.electrum_words = None
+        # (mnemonics, passphrase) master_seed is stretched from
+        self._bip39_input = None
         self.is_slip0010 = False
         self.path = None
 
-        self.spend_sec = None
-        self.spend_pub = None
-        self.view_sec = None
-        self.view_pub = None
+    def _reset(self, stages):
+        for stage in stages:
+            self.__dict__.pop(stage, None)
 
-    def set_seed(self, seed, path=None, slip0010=False):
-        """
-        Sets master secret for BIP44 derivation
-        :param seed:
-        :param path:
-        :param slip0010:
-        :return:
-        """
-        self.master_seed = seed
+    def _set_path(self, path, slip0010):
         self.is_slip0010 = slip0010
         if path is None:
             self.path = (
@@ -55,20 +69,35 @@ class SeedDerivation(object):
             )
         else:
             self.path = path
-        wl = Wallet.from_master_secret(seed, use_ed25519=slip0010)
-
-        # Generate private keys based on the gen mechanism. Bip44 path + Monero backward compatible
-        data = wl.get_child_for_path(self.path)
-        self.pre_hash = binascii.unhexlify(data.private_key.get_key())
+        self._reset(self._STAGES)
 
-        if slip0010:
-            self.monero_master = encodeint(decodeint(self.pre_hash))
-        else:
-            # Ledger way = words -> bip39 pbkdf -> master seed -> bip32 normal with
-            #  "Bitcoin seed" seed, get private key node -> cn_fast_hash -> monero master secret
-            self.monero_master = crypto.cn_fast_hash(self.pre_hash)
+    def set_mnemonics(
+        self, mnemonics, passphrase=b"", path=None, slip0010=False
+    ):
+        """
+        Sets the BIP39 mnemonics and passphrase for BIP44 derivation, the
+        master secret is computed from them on first use
+        :param mnemonics:
+        :param passphrase:
+        :param path:
+        :param slip0010:
+        :return:
+        """
+        self._bip39_input = (mnemonics, passphrase)
+        self._reset(("master_seed",))
+        self._set_path(path, slip0010)
 
-        self.set_monero_seed(self.monero_master)
+    def set_seed(self, seed, path=None, slip0010=False):
+        """
+        Sets master secret for BIP44 derivation
+        :param seed:
+        :param path:
+        :param slip0010:
+        :return:
+        """
+        self._bip39_input = None
+        self.master_seed = seed
+        self._set_path(path, slip0010)
 
     def set_monero_seed(self, seed):
         """
@@ -77,17 +106,90 @@ class SeedDerivation(object):
         :return:
         """
         # to_hash is initial seed in the Monero sense, recoverable from this seed
+        self._reset(self._STAGES[self._STAGES.index("monero_master") :])
         self.monero_master = seed
-        self.electrum_words = " ".join(
-            # mnemonic.mn_encode(self.monero_master, True))
-            mn_encode(self.monero_master, True)
-        )
 
-        keys = crypto.generate_monero_keys(self.monero_master)
-        self.spend_sec, self.spend_pub = (
-            keys  # , self.view_sec, self.view_pub = keys
+    @cached_property
+    def master_seed(self):
+        if self._bip39_input is None:
+            return None
+        mnemonics, passphrase = self._bip39_input
+        return bip39.mnemonics_to_seed(mnemonics, passphrase=passphrase)
+
+    @cached_property
+    def wallet(self):
+        if self.master_seed is None:
+            return None
+        return Wallet.from_master_secret(
+            self.master_seed, use_ed25519=self.is_slip0010
         )
 
+    @cached_property
+    def path_node(self):
+        if self.wallet is None:
+            return None
+        return self.wallet.get_child_for_path(self.path)
+
+    @cached_property
+    def pre_hash(self):
+        if self.path_node is None:
+            return None
+        return binascii.unhexlify(self.path_node.private_key.get_key())
+
+    @cached_property
+    def monero_master(self):
+        if self.pre_hash is None:
+            return None
+        if self.is_slip0010:
+            return encodeint(decodeint(self.pre_hash))
+        # Ledger way = words -> bip39 pbkdf -> master seed -> bip32 normal with
+        #  "Bitcoin seed" seed, get private key node -> cn_fast_hash -> monero master secret
+        return crypto.cn_fast_hash(self.pre_hash)
+
+    @cached_property
+    def electrum_words(self):
+        if self.monero_master is None:
+            return None
+        # mnemonic.mn_encode(self.monero_master, True))
+        return " ".join(mn_encode(self.monero_master, True))
+
+    @cached_property
+    def _spend_keys(self):
+        if self.monero_master is None:
+            return None, None
+        return crypto.generate_monero_keys(self.monero_master)
+
+    @property
+    def spend_sec(self):
+        return self._spend_keys[0]
+
+    @property
+    def spend_pub(self):
+        return self._spend_keys[1]
+
+    @cached_property
+    def _view_keys(self):
+        if self.spend_sec is None:
+            return None, None
+        return crypto.generate_view_keys(self.spend_sec)
+
+    @property
+    def view_sec(self):
+        return self._view_keys[0]
+
+    @property
+    def view_pub(self):
+        return self._view_keys[1]
+
+    @cached_property
+    def address(self):
+        """Main (0, 0) address on mainnet"""
+        from slip0010.address import encode_address
+
+        if self.spend_pub is None:
+            return None
+        return encode_address(bytes(self.spend_pub), bytes(self.view_pub))
+
     # def creds(self, network_type=NetworkTypes.MAINNET):
     #     return monero.AccountCreds.new_wallet(
     #         priv_view_key=self.view_sec,
@@ -123,12 +225,10 @@ class SeedDerivation(object):
         #     seed = bip32.Wallet.indices_to_bytes(indices)
 
         # else:
-        seed = bip39.mnemonics_to_seed(mnemonics, passphrase=passphrase)
-
         r = cls()
         r.mnemonics = mnems
         r.mnemonics_as_idx = as_index
-        r.set_seed(seed, *args, **kwargs)
+        r.set_mnemonics(mnemonics, passphrase, *args, **kwargs)
         return r
 
     @classmethod
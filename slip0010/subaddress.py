@@ -0,0 +1,186 @@
+"""Monero subaddress derivation and precomputed lookup tables"""
+
+import mmap
+import struct
+from itertools import islice
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from slip0010 import ed25519_2
+from slip0010 import keccak2
+from slip0010.ed25519 import EdPoint, EdScalar, cn_fast_hash_many, l
+
+SUBADDR_PREFIX = b"SubAddr\x00"
+
+TABLE_MAGIC = b"XMRSUBT1"
+# magic, first major, major count, first minor, minor count
+_HEADER = struct.Struct("<8sIIII")
+# spend public key || view public key
+RECORD_LEN = 64
+
+Subaddress = Tuple[int, int, bytes, bytes]
+
+
+def _index_bytes(major: int, minor: int) -> bytes:
+    return struct.pack("<II", major, minor)
+
+
+class SubaddressGenerator:
+    """
+    Generates subaddress public keys for one account.
+
+    wallet2 / device_default.cpp:
+        m = H_s("SubAddr\\0" || a || major || minor)
+        D = B + m*G
+        C = a*D
+    C is evaluated as a*B + (a*m)*G, so that both points of every
+    subaddress come from the fixed-base table and a single variable-base
+    multiplication is done per account.
+    """
+
+    def __init__(
+        self,
+        view_sec: Union[EdScalar, bytes, int],
+        spend_pub: Union[EdPoint, bytes],
+    ):
+        self.view_sec = EdScalar.ensure_scalar(view_sec)
+        if not isinstance(spend_pub, EdPoint):
+            spend_pub = EdPoint(spend_pub)
+        self.spend_pub = spend_pub
+        self._view_spend = ed25519_2.scalarmult(spend_pub.v, self.view_sec.v)
+        # "SubAddr\0" || a, hashed from a copy of its state one index at a
+        # time, or prepended to the indices of a batch
+        self._prefix_bytes = SUBADDR_PREFIX + bytes(self.view_sec)
+        self._prefix = keccak2.Keccak256(self._prefix_bytes)
+
+    def subaddress_secret(self, major: int, minor: int) -> EdScalar:
+        """m for the (major, minor) index"""
+        h = self._prefix.copy()
+        h.update(_index_bytes(major, minor))
+        return EdScalar(h.digest())
+
+    def _points(self, major: int, minor: int, m: Optional[int] = None):
+        if major == 0 and minor == 0:
+            return self.spend_pub.v, ed25519_2.scalarmult_B(self.view_sec.v)
+        if m is None:
+            m = self.subaddress_secret(major, minor).v
+        D = ed25519_2.edwards_add(self.spend_pub.v, ed25519_2.scalarmult_B(m))
+        C = ed25519_2.edwards_add(
+            self._view_spend, ed25519_2.scalarmult_B(self.view_sec.v * m % l)
+        )
+        return D, C
+
+    def get(self, major: int, minor: int) -> Tuple[bytes, bytes]:
+        """Encoded (spend, view) public keys of a single subaddress"""
+        D, C = self._points(major, minor)
+        return ed25519_2.encodepoint(D), ed25519_2.encodepoint(C)
+
+    def generate(
+        self, majors: range, minors: range, batch_size: int = 512
+    ) -> Iterator[Subaddress]:
+        """
+        Yields (major, minor, spend_pub, view_pub) over the grid, row-major.
+        Points are normalized batch_size at a time.
+        """
+        indices = ((i, j) for i in majors for j in minors)
+        while True:
+            batch = list(islice(indices, batch_size))
+            if not batch:
+                return
+            prefix = self._prefix_bytes
+            hashes = cn_fast_hash_many(
+                [prefix + _index_bytes(major, minor) for major, minor in batch]
+            )
+            points = []
+            for (major, minor), h in zip(batch, hashes):
+                points.extend(self._points(major, minor, EdScalar(h).v))
+            encoded = ed25519_2.encodepoints(points)
+            for k, (major, minor) in enumerate(batch):
+                yield major, minor, encoded[2 * k], encoded[2 * k + 1]
+
+
+def write_table(
+    path: str,
+    generator: SubaddressGenerator,
+    majors: range,
+    minors: range,
+    batch_size: int = 512,
+) -> None:
+    """
+    Writes the public keys of the grid to a table file, see SubaddressTable.
+    """
+    if majors.step != 1 or minors.step != 1:
+        raise ValueError("Only contiguous index ranges are supported")
+    with open(path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                TABLE_MAGIC,
+                majors.start,
+                len(majors),
+                minors.start,
+                len(minors),
+            )
+        )
+        for _, _, D, C in generator.generate(majors, minors, batch_size):
+            f.write(D)
+            f.write(C)
+
+
+class SubaddressTable:
+    """
+    Memory-mapped, read-only view of a table written by write_table.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, major0, n_major, minor0, n_minor = _HEADER.unpack_from(self._mm)
+        if magic != TABLE_MAGIC:
+            raise ValueError("Not a subaddress table")
+        if len(self._mm) != _HEADER.size + n_major * n_minor * RECORD_LEN:
+            raise ValueError("Truncated subaddress table")
+        self.majors = range(major0, major0 + n_major)
+        self.minors = range(minor0, minor0 + n_minor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return len(self.majors) * len(self.minors)
+
+    def _offset(self, n: int) -> int:
+        return _HEADER.size + n * RECORD_LEN
+
+    def __getitem__(self, index: Tuple[int, int]) -> Tuple[bytes, bytes]:
+        major, minor = index
+        if major not in self.majors or minor not in self.minors:
+            raise KeyError(index)
+        n = self.majors.index(major) * len(self.minors) + self.minors.index(
+            minor
+        )
+        off = self._offset(n)
+        return (
+            self._mm[off : off + 32],
+            self._mm[off + 32 : off + RECORD_LEN],
+        )
+
+    def __iter__(self) -> Iterator[Subaddress]:
+        off = self._offset(0)
+        for major in self.majors:
+            for minor in self.minors:
+                yield (
+                    major,
+                    minor,
+                    self._mm[off : off + 32],
+                    self._mm[off + 32 : off + RECORD_LEN],
+                )
+                off += RECORD_LEN
+
+    def spend_keys(self) -> Dict[bytes, Tuple[int, int]]:
+        """Lookup of subaddress index by spend public key"""
+        return {D: (major, minor) for major, minor, D, _ in self}
@@ -1,17 +1,36 @@
 import re
+import sys
 import hmac
 from hashlib import sha512
 from binascii import hexlify, unhexlify
 
-from ecdsa import SECP256k1, SigningKey  # type: ignore
-from ecdsa.ellipticcurve import Point  # type: ignore
-
-
-from util import memoize, IntegerUtils, hash160
+from util import memoize, memoize_method, IntegerUtils, hash160
+from util.instrument import stage
 from slip0010 import ed25519 as crypto
 
 long_or_int = int
-INFINITY = Point(None, None, None)
+
+
+# ecdsa is only needed off the ed25519 path, so it is imported on first
+# use: derive_monero and the frozen binary never load it
+def _secp256k1():
+    """The (SECP256k1, SigningKey) pair of ecdsa"""
+    from ecdsa import SECP256k1, SigningKey  # type: ignore
+
+    return SECP256k1, SigningKey
+
+
+@memoize
+def _infinity():
+    from ecdsa.ellipticcurve import Point  # type: ignore
+
+    return Point(None, None, None)
+
+
+def __getattr__(name):
+    if name == "INFINITY":
+        return _infinity()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def ensure_bytes(data):
@@ -174,6 +193,14 @@ class Wallet:
         # Split I into two 32-byte sequences, IL and IR.
         I_L, I_R = I[:32], I[32:]
         # Use IL as master secret key, and IR as master chain code.
+        if use_ed25519:
+            return cls(
+                private_key=Ed25519PrivateKey.from_hex_key(I_L),
+                chain_code=long_or_int(hexlify(I_R), 16),
+                seed_secret=seed,
+                use_ed25519=use_ed25519,
+                use_slip0010=use_slip0010,
+            )
         return cls(
             private_exponent=long_or_int(hexlify(I_L), 16),
             chain_code=long_or_int(hexlify(I_R), 16),
@@ -254,7 +281,8 @@ class Wallet:
         # 32 bits == 4 Bytes == 8 hex characters
         return b"0x" + self.identifier[:8]
 
-    @memoize
+    @stage("Wallet.get_child")
+    @memoize_method
     def get_child(self, child_number, is_prime=None, as_private=True):
         """Derive a child key.
         :param child_number: The number of the child key to compute
@@ -360,7 +388,7 @@ class Wallet:
             private_exponent = (
                 long_or_int(hexlify(I_L), 16)
                 + long_or_int(self.private_key.get_key(), 16)
-            ) % SECP256k1.order
+            ) % _secp256k1()[0].order
             # I_R is the child's chain code
             private_key = PrivateKey(private_exponent)
             public_key = private_key.get_public_key()
@@ -378,7 +406,7 @@ class Wallet:
         #     public_key = PublicKey.from_public_pair(
         #         PublicPair(point.x(), point.y()))
 
-        if public_key.to_point() == INFINITY:
+        if public_key.is_infinity():
             raise InfinityPointException("The point at infinity is invalid.")
 
         child = self.__class__(
@@ -460,15 +488,16 @@ class PrivateKey(Key):
         if not isinstance(secret_exponent, int):
             raise ValueError("secret_exponent must be a long")
         super().__init__(*args, **kwargs)
-        self._private_key = SigningKey.from_secret_exponent(
-            secret_exponent, curve=SECP256k1
+        curve, signing_key = _secp256k1()
+        self._private_key = signing_key.from_secret_exponent(
+            secret_exponent, curve=curve
         )
 
     def get_key(self):
         """Get the key - a hex formatted private exponent for the curve."""
         return ensure_bytes(hexlify(self._private_key.to_string()))
 
-    @memoize
+    @memoize_method
     def get_public_key(self):
         """Get the PublicKey for this PrivateKey."""
         return PublicKey.from_verifying_key(
@@ -552,6 +581,12 @@ class PublicKey(Key):
                 b"04" + long_to_hex(self.x, 64) + long_to_hex(self.y, 64)
             )
 
+    def to_point(self):
+        return self._verifying_key.pubkey.point
+
+    def is_infinity(self):
+        return self.to_point() == _infinity()
+
     @classmethod
     def from_verifying_key(cls, verifying_key, **kwargs):
         return cls(verifying_key, **kwargs)
@@ -571,7 +606,15 @@ class Ed25519PublicKey(PublicKey):
     def to_point(self):
         return self
 
+    def is_infinity(self):
+        return crypto.point_eq(self._key, crypto.identity())
+
     def __eq__(self, other):
-        if other == INFINITY:
-            return crypto.point_eq(self._key, crypto.identity())
-        return crypto.point_eq(self._key, other._key)
+        if isinstance(other, Ed25519PublicKey):
+            return crypto.point_eq(self._key, other._key)
+        # only an ecdsa point can be INFINITY, and if ecdsa is not loaded
+        # other is none; _infinity() would import it
+        ellipticcurve = sys.modules.get("ecdsa.ellipticcurve")
+        if ellipticcurve is not None and isinstance(other, ellipticcurve.Point):
+            return other == _infinity() and self.is_infinity()
+        return NotImplemented
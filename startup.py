@@ -0,0 +1,222 @@
+"""Startup profile of derive.py: import times, peak memory and phases
+
+    python derive.py --profile-startup [json|text]
+
+Every module imported while profiling is timed, like -X importtime but
+also inside the frozen binary, and allocations are traced with
+tracemalloc (which slows the imports down somewhat). Phases:
+
+    imports       importing ui and util, everything the TUI loads
+    wordlists     Wordlist instantiation, part of the imports
+    curve_tables  ed25519 base point tables, part of the imports
+    curses        terminfo loading by setupterm, the part of initscr
+                  that does not need a terminal
+
+Nothing touches the terminal, so it runs headless. Only modules not yet
+imported are timed, so this module imports nothing from the project and
+profile() must run before anything else does. The JSON report has a fixed
+layout, integer microseconds and bytes, modules in completion order.
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+from importlib import import_module
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+REPORT_VERSION = 1
+IMPORTS = ("ui", "util")
+
+# stage names, see util.instrument
+STAGES = {"Wordlist.__init__": "wordlists", "make_Bpow": "curve_tables"}
+
+BUDGET = {"total_us": 1_500_000, "peak_bytes": 48 << 20}
+
+Report = Dict[str, Any]
+
+
+def _us(seconds: float) -> int:
+    return int(seconds * 1e6)
+
+
+class _TimedLoader:
+    """Wraps a loader to time exec_module, restored on the module after"""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        module.__loader__ = self._loader
+        module.__spec__.loader = self._loader
+        self._timer.exec_module(self._loader, module)
+
+
+class ImportTimer:
+    """
+    sys.meta_path finder timing module execution while installed: self
+    and cumulative microseconds, import depth and, when tracemalloc is
+    tracing, net bytes allocated.
+    """
+
+    def __init__(self) -> None:
+        self.modules: List[Dict[str, Any]] = []
+        # time spent in nested imports, one entry per import in progress
+        self._children: List[float] = []
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(
+                    spec.loader, "exec_module"
+                ):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def exec_module(self, loader, module) -> None:
+        depth = len(self._children)
+        self._children.append(0.0)
+        before = tracemalloc.get_traced_memory()[0]
+        start = perf_counter()
+        try:
+            loader.exec_module(module)
+        finally:
+            elapsed = perf_counter() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            self.modules.append(
+                {
+                    "name": module.__name__,
+                    "depth": depth,
+                    "self_us": _us(elapsed - children),
+                    "cumulative_us": _us(elapsed),
+                    "bytes": tracemalloc.get_traced_memory()[0] - before,
+                }
+            )
+
+    def __enter__(self) -> "ImportTimer":
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        sys.meta_path.remove(self)
+
+
+def _phase(start: float) -> Dict[str, int]:
+    """Time since start and the traced peak since the last phase"""
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    return {"us": _us(perf_counter() - start), "peak_bytes": peak}
+
+
+def _setupterm() -> Optional[str]:
+    import curses
+
+    fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        curses.setupterm(os.environ.get("TERM") or "xterm", fd)
+    except curses.error as e:
+        return str(e)
+    finally:
+        os.close(fd)
+    return None
+
+
+def profile(imports: Sequence[str] = IMPORTS, memory: bool = True) -> Report:
+    """
+    Imports the modules, loads terminfo and returns the report. With
+    memory=False allocations are not traced and bytes are reported as 0.
+    """
+    started = perf_counter()
+    tracing = memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    timer = ImportTimer()
+    try:
+        with timer:
+            # stages only run once, at import, so collect from the start
+            from util.instrument import Stats, add_hook, remove_hook
+
+            stats = Stats()
+            add_hook(stats)
+            try:
+                start = perf_counter()
+                for name in imports:
+                    import_module(name)
+                phases = {"imports": _phase(start)}
+            finally:
+                remove_hook(stats)
+            start = perf_counter()
+            error = _setupterm()
+            phases["curses"] = _phase(start)
+            if error is not None:
+                phases["curses"]["error"] = error
+        total = perf_counter() - started
+        current, peak = tracemalloc.get_traced_memory()
+        # _phase resets the peak, so take the largest
+        peak = max([peak] + [p["peak_bytes"] for p in phases.values()])
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    for name, phase in STAGES.items():
+        phases[phase] = {
+            "calls": stats.calls.get(name, 0),
+            "us": _us(stats.seconds.get(name, 0.0)),
+        }
+    return {
+        "version": REPORT_VERSION,
+        "python": sys.version.split()[0],
+        "frozen": bool(getattr(sys, "frozen", False)),
+        "total_us": _us(total),
+        "memory": {"current_bytes": current, "peak_bytes": peak},
+        "phases": {name: phases[name] for name in sorted(phases)},
+        "modules": timer.modules,
+    }
+
+
+def over_budget(report: Report, budget: Dict[str, int] = BUDGET) -> List[str]:
+    """Descriptions of the budget entries the report exceeds"""
+    over = []
+    if report["total_us"] > budget["total_us"]:
+        over.append(
+            f"startup took {report['total_us']} us, "
+            f"budget {budget['total_us']} us"
+        )
+    if report["memory"]["peak_bytes"] > budget["peak_bytes"]:
+        over.append(
+            f"peak memory {report['memory']['peak_bytes']} bytes, "
+            f"budget {budget['peak_bytes']} bytes"
+        )
+    return over
+
+
+def to_json(report: Report) -> str:
+    return json.dumps(report, indent=2) + "\n"
+
+
+def to_text(report: Report) -> str:
+    """The modules in -X importtime format, then phases and memory"""
+    lines = ["import time: self [us] | cumulative | imported package"]
+    lines += [
+        f"import time: {m['self_us']:>10} | {m['cumulative_us']:>10} | "
+        f"{'  ' * m['depth']}{m['name']}"
+        for m in report["modules"]
+    ]
+    for name, phase in report["phases"].items():
+        lines.append(f"phase {name:13} {phase['us']:>10} us")
+    lines.append(f"total {report['total_us']:>24} us")
+    lines.append(f"peak memory {report['memory']['peak_bytes']:>18} bytes")
+    return "\n".join(lines) + "\n"
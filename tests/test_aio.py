@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+
+from slip0010.aio import derive_monero_async, derive_monero_many
+from slip0010.sd import SeedDerivation
+from tests.util import JSONUtils
+
+
+class TestAsyncDerivation(unittest.IsolatedAsyncioTestCase):
+    vectors = JSONUtils.load_vectors_from_file("tests/test_vectors.json")
+
+    async def test_derive(self):
+        v = self.vectors[0]
+        sd = await derive_monero_async(v.bip39, v.passp)
+        ref = SeedDerivation.derive_monero(v.bip39, v.passp)
+        self.assertEqual(sd.electrum_words, v.monero_mnem)
+        self.assertEqual(sd.address, v.public_addr)
+        self.assertEqual(sd.pre_hash, ref.pre_hash)
+
+    async def test_many(self):
+        records = [(v.bip39, v.passp) for v in self.vectors]
+        out = [
+            (i, sd.electrum_words)
+            async for i, sd in derive_monero_many(records, concurrency=2)
+        ]
+        self.assertEqual(
+            sorted(out),
+            [(i, v.monero_mnem) for i, v in enumerate(self.vectors)],
+        )
+        ordered = derive_monero_many(iter(records), ordered=True)
+        self.assertEqual([i async for i, _ in ordered], list(range(5)))
+
+    async def test_semaphore(self):
+        v = self.vectors[1]
+        sem = asyncio.Semaphore(1)
+        sds = await asyncio.gather(
+            *(
+                derive_monero_async(v.bip39, v.passp, semaphore=sem)
+                for _ in "ab"
+            )
+        )
+        self.assertEqual([sd.electrum_words for sd in sds], [v.monero_mnem] * 2)
+
+    async def test_cancel(self):
+        v = self.vectors[0]
+        task = asyncio.ensure_future(derive_monero_async(v.bip39, v.passp))
+        await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        records = [(v.bip39, v.passp)] * 4
+        it = derive_monero_many(records, concurrency=4)
+        await it.__anext__()
+        await it.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
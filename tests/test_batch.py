@@ -0,0 +1,82 @@
+import io
+import json
+import unittest
+
+from slip0010.batch import derive_record, derive_records, read_records, run
+from slip0010.ring import RECORD, ResultRing, derive_into
+from tests.util import JSONUtils
+
+
+class TestBatch(unittest.TestCase):
+    vectors = JSONUtils.load_vectors_from_file("tests/test_vectors.json")
+
+    def _records(self):
+        return [(v.bip39, v.passp) for v in self.vectors]
+
+    def test_vectors(self):
+        out = list(derive_records(self._records(), processes=1, addresses=True))
+        for i, (v, rec) in enumerate(zip(self.vectors, out)):
+            self.assertEqual(rec["index"], i)
+            self.assertEqual(rec["electrum_words"], v.monero_mnem)
+            self.assertEqual(rec["address"], v.public_addr)
+
+    def test_pool(self):
+        ref = list(derive_records(self._records(), processes=1))
+        ordered = derive_records(self._records(), processes=2, window=2)
+        self.assertEqual(list(ordered), ref)
+        unordered = derive_records(
+            self._records(), processes=2, ordered=False, window=2
+        )
+        self.assertEqual(sorted(unordered, key=lambda r: r["index"]), ref)
+
+    def test_shm_transport(self):
+        records = [("abandon " * 12, "")] + self._records()
+        ref = list(derive_records(records, processes=1, addresses=True))
+        shm = derive_records(
+            records, processes=2, window=3, addresses=True, transport="shm"
+        )
+        self.assertEqual(list(shm), ref)
+        self.assertIn("error", ref[0])
+        with self.assertRaises(ValueError):
+            list(derive_records(records, transport="json"))
+
+    def test_ring(self):
+        self.assertEqual(RECORD.size, 320)
+        v = self.vectors[0]
+        with ResultRing(2) as ring:
+            slot = ring.acquire()
+            self.assertEqual(
+                derive_into((7, v.bip39, v.passp, slot), ring.name),
+                (slot, None),
+            )
+            rec = ring.read(slot)
+            self.assertEqual(ring.free, [1, 0])
+        self.assertEqual(rec, derive_record((7, v.bip39, v.passp)))
+
+    def test_formats(self):
+        v = self.vectors[1]
+        jsonl = json.dumps({"mnemonic": v.bip39, "passphrase": v.passp})
+        csv = f'mnemonic,passphrase\n"{v.bip39}",{v.passp}\n'
+        self.assertEqual(
+            list(read_records(io.StringIO(jsonl + "\n\n"))),
+            list(read_records(io.StringIO(csv), "csv")),
+        )
+
+    def test_errors(self):
+        words = self.vectors[0].bip39.split(" ")
+        lines = [
+            {"mnemonic": " ".join(words[:-1] + ["zoo"])},
+            {"mnemonic": " ".join(words[:-1] + ["xyzzy"])},
+            {"mnemonic": " ".join(w[:4] for w in words)},
+        ]
+        infile = io.StringIO("".join(json.dumps(x) + "\n" for x in lines))
+        outfile = io.StringIO()
+        self.assertEqual(run(infile, outfile, processes=1), 2)
+        out = [json.loads(line) for line in outfile.getvalue().splitlines()]
+        self.assertIn("checksum", out[0]["error"])
+        self.assertIn("xyzzy", out[1]["error"])
+        self.assertEqual(out[2]["electrum_words"], self.vectors[0].monero_mnem)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import random
+import unittest
+from unittest import mock
+
+import bench
+from bip39 import Bip39WordsNum, validate_checksum
+
+
+class TestBench(unittest.TestCase):
+    def test_synthetic_mnemonic(self):
+        rng = random.Random(0)
+        for words in (12, 15, 18, 21, 24):
+            mnem = bench.synthetic_mnemonic(rng, words).split(" ")
+            self.assertEqual(len(mnem), words)
+            self.assertTrue(validate_checksum(mnem, Bip39WordsNum(words)))
+
+    def test_run_compare(self):
+        report = bench.run(
+            ["keccak", "mn_encode"], repeat=2, warmup=0, synthetic=1
+        )
+        self.assertEqual(set(report["stages"]), {"keccak", "mn_encode"})
+        stats = report["stages"]["keccak"]
+        self.assertLessEqual(stats["min"], stats["median"])
+        self.assertEqual(stats["calls"], 4 + 6)
+
+        slower = {
+            "stages": dict(
+                report["stages"],
+                keccak=dict(stats, median=stats["median"] * 2),
+            )
+        }
+        rows = bench.compare(report, slower, threshold=0.5)
+        self.assertEqual(
+            sorted((r[0], r[4]) for r in rows),
+            [("keccak", True), ("mn_encode", False)],
+        )
+        rows = bench.compare(slower, report, threshold=0.5)
+        self.assertFalse(rows[0][4])
+        zero = {"stages": {"keccak": dict(stats, median=0.0)}}
+        self.assertEqual(bench.compare(zero, zero)[0][3], 0.0)
+        rows = bench.compare(zero, {"stages": {"keccak": stats}})
+        self.assertEqual(rows[0][3:], (float("inf"), True))
+        rows = bench.compare(report, {"stages": {}}, threshold=0.5)
+        self.assertEqual(
+            sorted((r[0], r[2], r[4]) for r in rows),
+            [("keccak", None, True), ("mn_encode", None, True)],
+        )
+
+        with self.assertRaises(ValueError):
+            bench.run(["nope"], repeat=1, synthetic=0)
+
+    def test_lazy_inputs(self):
+        # pbkdf2 only needs the mnemonics, nothing is derived for it
+        derive = mock.patch.object(
+            bench.SeedDerivation, "derive_monero", side_effect=AssertionError
+        )
+        with derive:
+            report = bench.run(["pbkdf2"], repeat=1, warmup=0, synthetic=0)
+        self.assertEqual(list(report["stages"]), ["pbkdf2"])
+
+    def test_thread_scaling(self):
+        report = bench.thread_scaling((1, 2), synthetic=0, rounds=1)
+        self.assertEqual(list(report["threads"]), ["1", "2"])
+        self.assertEqual(report["threads"]["1"]["speedup"], 1.0)
+        self.assertGreater(report["threads"]["2"]["per_second"], 0)
+        self.assertIn("gil_enabled", report["meta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+import bip39
+from tests.util import JSONUtils
+
+
+class TestSeed(unittest.TestCase):
+    def test_single(self):
+        line = JSONUtils.load_vectors_from_file("tests/test_vectors.json")[0]
+        seeds = bip39.mnemonics_to_seed_many(
+            [line.bip39], line.passp.encode("utf8")
+        )
+        self.assertEqual(seeds, [line.entropy])
+
+    def test_many(self):
+        lines = JSONUtils.load_vectors_from_file("tests/test_vectors.json")
+        seeds = [line.bip39 for line in lines]
+        passphrases = [line.passp.encode("utf8") for line in lines]
+        self.assertEqual(
+            bip39.mnemonics_to_seed_many(seeds, passphrases),
+            [line.entropy for line in lines],
+        )
+        with self.assertRaises(ValueError):
+            bip39.mnemonics_to_seed_many(seeds, passphrases[1:])
+
+
+if __name__ == "__main__":
+    unittest.main()
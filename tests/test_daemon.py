@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from slip0010.daemon import Daemon, derive_records_remote
+from tests.util import JSONUtils
+
+
+class TestDaemon(unittest.IsolatedAsyncioTestCase):
+    vectors = JSONUtils.load_vectors_from_file("tests/test_vectors.json")
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "derive.sock")
+        self.daemon = Daemon(self.path, processes=1)
+        ready = asyncio.Event()
+        self.task = asyncio.ensure_future(self.daemon.serve(ready))
+        await ready.wait()
+
+    async def asyncTearDown(self):
+        self.task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await self.task
+        self.assertFalse(os.path.exists(self.path))
+        self.tmp.cleanup()
+
+    async def test_coalesce(self):
+        v = self.vectors[0]
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        req = {"mnemonic": v.bip39, "passphrase": v.passp, "addresses": True}
+        for i in range(3):
+            writer.write(json.dumps(dict(req, id=f"r{i}")).encode() + b"\n")
+        writer.write(b"not json\n")
+        writer.write(json.dumps({"id": "r4"}).encode() + b"\n")
+        await writer.drain()
+        out = [json.loads(await reader.readline()) for _ in range(5)]
+        writer.close()
+        self.assertEqual(len(self.daemon.inflight), 0)
+        ok = sorted((r for r in out if "error" not in r), key=lambda r: r["id"])
+        self.assertEqual([r["id"] for r in ok], ["r0", "r1", "r2"])
+        for r in ok:
+            self.assertEqual(r["electrum_words"], v.monero_mnem)
+            self.assertEqual(r["address"], v.public_addr)
+        errors = {r["id"]: r["error"] for r in out if "error" in r}
+        self.assertEqual(sorted(errors, key=str), [3, "r4"])
+        self.assertIn("mnemonic", errors["r4"])
+
+    async def test_remote_records(self):
+        records = [(v.bip39, v.passp) for v in self.vectors]
+        out = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: list(derive_records_remote(self.path, records))
+        )
+        self.assertEqual([r["index"] for r in out], list(range(5)))
+        self.assertEqual(
+            [r["electrum_words"] for r in out],
+            [v.monero_mnem for v in self.vectors],
+        )
+
+
+class TestBatcher(unittest.IsolatedAsyncioTestCase):
+    async def test_split(self):
+        daemon = Daemon("unused", processes=3, batch_size=4)
+        daemon.queue = asyncio.Queue()
+        sizes = []
+
+        async def run_batch(batch, slots):
+            sizes.append(len(batch))
+            slots.release()
+
+        daemon._run_batch = run_batch  # type: ignore
+        # one request per worker until there are more than workers, then
+        # even shares of at most batch_size
+        for n, expected in ((2, [1, 1]), (7, [3, 3, 1]), (12, [4, 4, 4])):
+            for i in range(n):
+                daemon.queue.put_nowait((i, None))
+            batcher = asyncio.ensure_future(daemon._batcher())
+            while sum(sizes) < n:
+                await asyncio.sleep(0.001)
+            batcher.cancel()
+            self.assertEqual(sizes, expected)
+            sizes.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from slip0010 import ed25519_2
+
+
+class TestOpCounts(unittest.TestCase):
+    P = ed25519_2.scalarmult_B(5)
+
+    def test_scalarmult(self):
+        e = 123456789
+        report = ed25519_2.cost_report(ed25519_2.scalarmult_B, e)
+        adds = bin(e).count("1")
+        self.assertEqual(
+            report,
+            {
+                "scalarmult_B": {
+                    "D": adds,
+                    "M": 8 * adds,
+                    "add": adds,
+                    "calls": 1,
+                }
+            },
+        )
+        report = ed25519_2.cost_report(ed25519_2.scalarmult, self.P, 0b1011)
+        self.assertEqual(report["scalarmult"]["add"], 3)
+        self.assertEqual(report["scalarmult"]["double"], 4)
+        self.assertEqual(report["scalarmult"]["calls"], 1)
+
+    def test_inversions(self):
+        with ed25519_2.count_ops() as ops:
+            ed25519_2.encodepoints([self.P] * 10)
+            ed25519_2.decodepoint(ed25519_2.encodepoint(self.P))
+        report = ops.cost_report()
+        # one inversion for the whole batch
+        self.assertEqual(report["encodepoints"]["inv"], 1)
+        self.assertEqual(report["encodepoint"]["inv"], 1)
+        self.assertEqual(report["decodepoint"]["sqrt"], 1)
+        self.assertNotIn("other", report)
+
+    def test_restored(self):
+        add = ed25519_2.edwards_add
+        with ed25519_2.count_ops():
+            self.assertIsNot(ed25519_2.edwards_add, add)
+        self.assertIs(ed25519_2.edwards_add, add)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import pytest
 import unittest
 
+import util
 from util import hash160, hash160_hashlib
 
 
@@ -13,3 +14,13 @@ class TestUtils(unittest.TestCase):
         b = b"\x01\x02\x03\x04"
 
         self.assertEqual(hash160(b), hash160_hashlib(b))
+
+    def test_backend(self):
+        b = b"\x01\x02\x03\x04"
+        self.assertIn(
+            util.hash160_backend(), ("hashlib", "pycryptodome", "builtin")
+        )
+        self.assertEqual(
+            util.ripemd160(b),
+            util._ripemd160_builtin(b),  # pylint: disable=W0212
+        )
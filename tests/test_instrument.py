@@ -0,0 +1,81 @@
+import asyncio
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from util import instrument
+from slip0010.sd import SeedDerivation
+
+
+class TestInstrument(unittest.TestCase):
+    MNEM = " ".join(["abandon"] * 11 + ["about"])
+
+    def test_stages(self):
+        with instrument.instrument() as stats:
+            sd = SeedDerivation.derive_monero(self.MNEM, "")
+            _ = sd.electrum_words, sd.address
+        calls = stats.as_dict()
+        self.assertEqual(calls["bip39.mnemonics_to_seed"]["calls"], 1)
+        # m/44'/128'/0'
+        self.assertEqual(calls["Wallet.get_child"]["calls"], 3)
+        for name in (
+            "cn_fast_hash",
+            "scalarmult_B",
+            "encodepoint",
+            "mn_encode",
+        ):
+            self.assertGreater(calls[name]["calls"], 0)
+            self.assertGreaterEqual(calls[name]["seconds"], 0)
+        self.assertEqual(json.loads(stats.to_json()), calls)
+        prom = stats.to_prometheus()
+        self.assertIn('derive_stage_calls_total{stage="mn_encode"} 1\n', prom)
+
+    def test_disabled_and_hooks(self):
+        seen = []
+
+        def hook(name, _):
+            seen.append(name)
+
+        with instrument.instrument() as stats:
+            pass
+        instrument.add_hook(hook)
+        try:
+            SeedDerivation.from_monero_seed(bytes(32)).electrum_words
+        finally:
+            instrument.remove_hook(hook)
+        SeedDerivation.from_monero_seed(bytes(32)).electrum_words
+        self.assertEqual(stats.as_dict(), {})
+        self.assertEqual(seen, ["mn_encode"])
+
+    def test_concurrent(self):
+        def run(seeds):
+            with instrument.instrument() as stats:
+                ready.wait()
+                for seed in seeds:
+                    SeedDerivation.from_monero_seed(seed).electrum_words
+            return stats.as_dict()["mn_encode"]["calls"]
+
+        ready = threading.Barrier(2)
+        with ThreadPoolExecutor(2) as ex:
+            counts = list(
+                ex.map(run, [[bytes(32)], [bytes(32), bytes([1] * 32)]])
+            )
+        self.assertEqual(counts, [1, 2])
+
+    def test_tasks(self):
+        async def run(n):
+            with instrument.instrument() as stats:
+                for _ in range(n):
+                    SeedDerivation.from_monero_seed(bytes(32)).electrum_words
+                    await asyncio.sleep(0)
+            return stats.as_dict()["mn_encode"]["calls"]
+
+        async def main():
+            return await asyncio.gather(run(1), run(3))
+
+        self.assertEqual(asyncio.run(main()), [1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from hypothesis import given  # type: ignore
+from hypothesis import strategies as st
+
+from Crypto.Hash import keccak as ref  # type: ignore
+
+from slip0010 import keccak2
+from slip0010.ed25519 import cn_fast_hash, cn_fast_hash_many
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestKeccak(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(
+            cn_fast_hash(b"").hex(),
+            "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470",
+        )
+
+    @given(st.binary(max_size=600))
+    def test_keccak256(self, data):
+        self.assertEqual(
+            cn_fast_hash(data), ref.new(digest_bits=256, data=data).digest()
+        )
+
+    @given(st.binary(max_size=300), st.sampled_from([224, 256, 384, 512]))
+    def test_presets(self, data, bits):
+        h = getattr(keccak2, f"Keccak{bits}")()
+        h.update(data)
+        self.assertEqual(
+            h.digest(), ref.new(digest_bits=bits, data=data).digest()
+        )
+
+    @given(st.binary(max_size=600), st.integers(min_value=1, max_value=200))
+    def test_chunked_update(self, data, step):
+        h = keccak2.Keccak256()
+        mv = memoryview(data)
+        for i in range(0, len(data), step):
+            h.update(bytearray(mv[i : i + step]) if i % 2 else mv[i : i + step])
+        self.assertEqual(h.digest(), cn_fast_hash(data))
+
+    def test_copy(self):
+        prefix = keccak2.Keccak256(b"SubAddr\x00" + bytes(32))
+        forks = []
+        for i in range(3):
+            h = prefix.copy()
+            h.update(bytes([i]))
+            forks.append(h)
+        self.assertEqual(
+            prefix.digest(), cn_fast_hash(b"SubAddr\x00" + bytes(32))
+        )
+        for i, h in enumerate(forks):
+            self.assertEqual(
+                h.digest(),
+                cn_fast_hash(b"SubAddr\x00" + bytes(32) + bytes([i])),
+            )
+            # digest leaves the hash usable
+            self.assertEqual(h.digest(), h.digest())
+
+    @given(st.lists(st.binary(max_size=300), max_size=20))
+    def test_many(self, buffers):
+        buffers += buffers
+        self.assertEqual(
+            cn_fast_hash_many(buffers), [cn_fast_hash(b) for b in buffers]
+        )
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_permutation_many(self):
+        from slip0010.keccak_np import keccak_f1600_many
+
+        lanes = [
+            [(i * 25 + j) * 0x9E3779B97F4A7C15 % 2**64 for j in range(25)]
+            for i in range(3)
+        ]
+        S = np.array(lanes, dtype=np.uint64)
+        keccak_f1600_many(S)
+        for A, row in zip(lanes, S.tolist()):
+            keccak2.keccak_f1600(A)
+            self.assertEqual(A, row)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from hypothesis import given  # type: ignore
+from hypothesis import strategies as st
+
+from monero_mnemonic import (
+    get_checksum,
+    mn_decode,
+    mn_decode_many,
+    mn_encode,
+    mn_encode_many,
+)
+from tests.util import JSONUtils
+
+
+class TestMoneroMnemonic(unittest.TestCase):
+    def test_zero(self):
+        self.assertEqual(mn_encode(bytes(32), True), ["abbey"] * 25)
+        self.assertEqual(mn_encode(bytes(16)), ["abbey"] * 12)
+
+    @given(st.lists(st.binary(min_size=32, max_size=32), max_size=5))
+    def test_encode_checksum(self, seeds):
+        for words in mn_encode_many(seeds, True):
+            self.assertEqual(len(words), 25)
+            self.assertEqual(words[-1], get_checksum(words[:24]))
+
+    def test_length(self):
+        with self.assertRaises(ValueError):
+            mn_encode(bytes(30))
+        with self.assertRaises(ValueError):
+            mn_encode_many([bytes(32), bytes(30)])
+
+    @given(
+        st.lists(
+            st.binary(min_size=16, max_size=16)
+            | st.binary(min_size=32, max_size=32),
+            max_size=5,
+        ),
+        st.booleans(),
+    )
+    def test_round_trip(self, seeds, checksum):
+        phrases = mn_encode_many(seeds, checksum)
+        self.assertEqual(phrases, [mn_encode(s, checksum) for s in seeds])
+        self.assertEqual(mn_decode_many(phrases), seeds)
+        prefixes = [[w[:3] for w in words] for words in phrases]
+        self.assertEqual(mn_decode_many(prefixes), seeds)
+
+    def test_vectors(self):
+        for line in JSONUtils.load_vectors_from_file("tests/test_vectors.json"):
+            if line.monero_mnem is not None:
+                words = line.monero_mnem.split(" ")
+                self.assertEqual(mn_encode(mn_decode(words), True), words)
+
+    def test_invalid(self):
+        words = ["abbey"] * 25
+        with self.assertRaises(ValueError):
+            mn_decode(words[:24] + ["zoom"])
+        with self.assertRaises(ValueError):
+            mn_decode(words[:23] + ["xyzzy", "abbey"])
+        with self.assertRaises(ValueError):
+            mn_decode(words[:20])
+        # 1626**3 > 2**32, the last triplets do not fit in a word
+        with self.assertRaises(ValueError):
+            mn_decode(["zoom", "zones", "zombie"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
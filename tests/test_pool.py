@@ -0,0 +1,61 @@
+import gc
+import multiprocessing
+import os
+import sys
+import unittest
+
+from slip0010 import pool
+from slip0010.batch import derive_record
+from tests.util import JSONUtils
+
+
+def _set_tag(tag):
+    os.environ["POOL_TEST_TAG"] = tag
+
+
+def _task(_):
+    buf = pool.scratch("buf", lambda: bytearray(32))
+    preloaded = all(name in sys.modules for name in pool.PRELOAD)
+    return os.getpid(), id(buf), os.environ.get("POOL_TEST_TAG"), preloaded
+
+
+class TestPool(unittest.TestCase):
+    vectors = JSONUtils.load_vectors_from_file("tests/test_vectors.json")
+
+    def _check(self, method):
+        with pool.pool(2, _set_tag, ("warm",), method=method) as workers:
+            out = workers.map(_task, range(8), chunksize=1)
+            jobs = [(i, v.bip39, v.passp) for i, v in enumerate(self.vectors)]
+            recs = workers.map(derive_record, jobs)
+        for pid, buf, tag, preloaded in out:
+            self.assertEqual(tag, "warm")
+            self.assertTrue(preloaded)
+            # one scratch buffer per worker, reused by its jobs
+            self.assertEqual({b for p, b, _, _ in out if p == pid}, {buf})
+        for v, rec in zip(self.vectors, recs):
+            self.assertEqual(rec["electrum_words"], v.monero_mnem)
+
+    @unittest.skipUnless(
+        "forkserver" in multiprocessing.get_all_start_methods(),
+        "no forkserver",
+    )
+    def test_forkserver(self):
+        self._check("forkserver")
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "no fork"
+    )
+    def test_fork(self):
+        self._check("fork")
+        with pool.pool(1, method="fork") as workers:
+            frozen = workers.apply(gc.get_freeze_count)
+        self.assertGreater(frozen, 0)
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_scratch(self):
+        a = pool.scratch("test_scratch", list)
+        self.assertIs(pool.scratch("test_scratch", list), a)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from hypothesis import given  # type: ignore
+from hypothesis import strategies as st
+
+from Crypto.Hash import RIPEMD160 as ref  # type: ignore
+
+from util.ripemd160 import RIPEMD160
+
+
+class TestRIPEMD160(unittest.TestCase):
+    def test_vectors(self):
+        self.assertEqual(
+            RIPEMD160().calculate_hash(bytearray(b"")),
+            "9c1185a5c5e9fc54612808977ee8f548b2258d31",
+        )
+        self.assertEqual(
+            RIPEMD160().generate_hash("abc"),
+            "8eb208f7e05d987a9b044a8e98c6b087f15a0bfc",
+        )
+
+    @given(st.binary(max_size=300))
+    def test_digest(self, data):
+        self.assertEqual(
+            RIPEMD160().calculate_digest(bytearray(data)),
+            ref.new(data).digest(),
+        )
+
+    @given(st.binary(max_size=600), st.integers(min_value=1, max_value=200))
+    def test_chunked_update(self, data, step):
+        h = RIPEMD160()
+        mv = memoryview(data)
+        for i in range(0, len(data), step):
+            h.update(bytearray(mv[i : i + step]) if i % 2 else mv[i : i + step])
+        self.assertEqual(h.hexdigest(), ref.new(data).hexdigest())
+        # digest leaves the hash usable
+        h.update(b"x")
+        self.assertEqual(h.digest(), ref.new(data + b"x").digest())
+
+    def test_reuse(self):
+        h = RIPEMD160(b"state")
+        for _ in range(2):
+            self.assertEqual(
+                h.calculate_hash(bytearray(b"abc")),
+                "8eb208f7e05d987a9b044a8e98c6b087f15a0bfc",
+            )
+        self.assertEqual(h.digest(), ref.new(b"state").digest())
+
+    def test_copy(self):
+        prefix = RIPEMD160(b"a" * 100)
+        fork = prefix.copy()
+        fork.update(b"b")
+        self.assertEqual(prefix.digest(), ref.new(b"a" * 100).digest())
+        self.assertEqual(fork.digest(), ref.new(b"a" * 100 + b"b").digest())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from binascii import hexlify
+
+from slip0010 import ed25519 as crypto
+from slip0010 import ed25519_2
+from slip0010.scanner import (
+    OutputScanner,
+    _array_items,
+    encode_varint,
+    read_transactions,
+    scan_file,
+    scan_transactions,
+)
+from slip0010.subaddress import SubaddressGenerator
+
+SPEND_SEC = crypto.hash_to_scalar(b"spend")
+
+
+def _hex(b):
+    return hexlify(b).decode()
+
+
+def _send(r, dest_view_pub, dest_spend_pub, index):
+    """Sender side one-time key for output index"""
+    der = ed25519_2.scalarmult(ed25519_2.decodepoint(dest_view_pub), r.v * 8)
+    s = crypto.hash_to_scalar(ed25519_2.encodepoint(der) + encode_varint(index))
+    P = ed25519_2.edwards_add(
+        ed25519_2.decodepoint(dest_spend_pub), ed25519_2.scalarmult_B(s.v)
+    )
+    return _hex(ed25519_2.encodepoint(P))
+
+
+def _dump():
+    view_sec, view_pub = crypto.generate_view_keys(SPEND_SEC)
+    spend_pub = bytes(crypto.scalarmult_base(SPEND_SEC))
+    D, C = SubaddressGenerator(view_sec, spend_pub).get(1, 2)
+    r = crypto.hash_to_scalar(b"tx key")
+    r2 = crypto.hash_to_scalar(b"additional tx key")
+    other = bytes(crypto.scalarmult_base(crypto.hash_to_scalar(b"other")))
+    R = ed25519_2.encodepoint(ed25519_2.scalarmult_B(r.v))
+    R2 = ed25519_2.encodepoint(
+        ed25519_2.scalarmult(ed25519_2.decodepoint(D), r2.v)
+    )
+    return [
+        {
+            "tx_hash": "aa",
+            "tx_pubkey": _hex(R),
+            "additional_pubkeys": [_hex(R), _hex(R2), _hex(R)],
+            "outputs": [
+                {"index": 0, "key": _send(r, bytes(view_pub), spend_pub, 0)},
+                {"index": 1, "key": _send(r2, C, D, 1)},
+                {"index": 2, "key": _send(r, other, other, 2)},
+            ],
+        },
+        {
+            "tx_hash": "bb",
+            "tx_pubkey": _hex(R),
+            "outputs": [{"key": _send(r, other, other, 0)}],
+        },
+    ]
+
+
+class TestScanner(unittest.TestCase):
+    def test_scan(self):
+        scanner = OutputScanner.from_spend_sec(
+            SPEND_SEC, majors=range(2), minors=range(3)
+        )
+        owned = list(scan_transactions(_dump(), scanner, processes=1))
+        self.assertEqual(
+            [(o.tx_hash, o.output_index, o.major, o.minor) for o in owned],
+            [("aa", 0, 0, 0), ("aa", 1, 1, 2)],
+        )
+
+    def test_without_hash(self):
+        scanner = OutputScanner.from_spend_sec(
+            SPEND_SEC, majors=range(2), minors=range(3)
+        )
+        aa = _dump()[0]
+        del aa["tx_hash"]
+        owned = list(scan_transactions([aa, dict(aa)], scanner, processes=1))
+        self.assertEqual(
+            [(o.tx_hash, o.output_index) for o in owned],
+            [("", 0), ("", 1), ("", 0), ("", 1)],
+        )
+
+    def test_invalid_keys(self):
+        scanner = OutputScanner.from_spend_sec(
+            SPEND_SEC, majors=range(2), minors=range(3)
+        )
+        # y = 2 has no x on the curve
+        bad = _hex((2).to_bytes(32, "little"))
+        aa, bb = _dump()
+        broken_tx = dict(bb, tx_hash="cc", tx_pubkey=bad)
+        aa["additional_pubkeys"][2] = bad
+        aa["outputs"].append({"index": 3, "key": bad})
+        # the outputs are still found through their additional keys
+        ee = dict(aa, tx_hash="ee", tx_pubkey=bad)
+        txs = [broken_tx, aa, dict(broken_tx, tx_hash="dd"), bb, ee]
+        owned = list(scan_transactions(txs, scanner, processes=1))
+        self.assertEqual(
+            [(o.tx_hash, o.output_index) for o in owned],
+            [("aa", 0), ("aa", 1), ("ee", 0), ("ee", 1)],
+        )
+
+    def test_read_array(self):
+        txs = _dump()
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(txs, f, indent=1)
+        try:
+            self.assertEqual(list(read_transactions(path)), txs)
+        finally:
+            os.remove(path)
+        text = json.dumps(txs)[1:]
+        for chunk_size in (1, 7, 1 << 16):
+            items = _array_items(io.StringIO(text), chunk_size)
+            self.assertEqual(list(items), txs)
+        self.assertEqual(list(_array_items(io.StringIO(" ]"))), [])
+        for broken in ("{}", "{} {}]", "{},"):
+            with self.assertRaises(ValueError):
+                list(_array_items(io.StringIO(broken), 2))
+
+    def test_scan_file_pool(self):
+        scanner = OutputScanner.from_spend_sec(
+            SPEND_SEC, majors=range(2), minors=range(3)
+        )
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        with os.fdopen(fd, "w") as f:
+            for tx in _dump():
+                f.write(json.dumps(tx) + "\n")
+        try:
+            owned = list(scan_file(path, scanner, processes=2, chunk_size=1))
+        finally:
+            os.remove(path)
+        self.assertEqual([o.output_index for o in owned], [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import gc
+import subprocess
+import sys
+import unittest
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from slip0010.sd import DEFAULT_SLIP0010_PATH, SeedDerivation
+from slip0010.wallet import Wallet
+from tests.util import JSONUtils
+
+
+class TestSeedDerivation(unittest.TestCase):
+    vector = JSONUtils.load_vectors_from_file("tests/test_vectors.json")[0]
+
+    def test_lazy_stages(self):
+        sd = SeedDerivation.derive_monero(self.vector.bip39, self.vector.passp)
+        self.assertNotIn("master_seed", sd.__dict__)
+        self.assertNotIn("wallet", sd.__dict__)
+        self.assertEqual(sd.electrum_words, self.vector.monero_mnem)
+        self.assertIn("monero_master", sd.__dict__)
+        self.assertNotIn("_spend_keys", sd.__dict__)
+        self.assertEqual(sd.address, self.vector.public_addr)
+
+    def test_set_monero_seed(self):
+        sd = SeedDerivation.derive_monero(self.vector.bip39, self.vector.passp)
+        other = SeedDerivation.from_monero_seed(bytes(32))
+        self.assertIsNone(other.pre_hash)
+        self.assertEqual(other.electrum_words, " ".join(["abbey"] * 25))
+        _ = sd.spend_pub
+        sd.set_monero_seed(bytes(32))
+        self.assertEqual(sd.electrum_words, other.electrum_words)
+        self.assertEqual(bytes(sd.spend_pub), bytes(other.spend_pub))
+        self.assertIsNotNone(sd.pre_hash)
+
+    def test_threads(self):
+        vectors = JSONUtils.load_vectors_from_file("tests/test_vectors.json")
+
+        def derive(v):
+            sd = SeedDerivation.derive_monero(v.bip39, v.passp)
+            return sd.electrum_words, sd.address
+
+        with ThreadPoolExecutor(4) as ex:
+            results = list(ex.map(derive, vectors * 2))
+        for v, (words, address) in zip(vectors * 2, results):
+            self.assertEqual(words, v.monero_mnem)
+            self.assertEqual(address, v.public_addr)
+
+    def test_wallets_freed(self):
+        wl = Wallet.from_master_secret(bytes(32), use_ed25519=True)
+        child = wl.get_child_for_path(DEFAULT_SLIP0010_PATH)
+        self.assertIs(wl.get_child_for_path(DEFAULT_SLIP0010_PATH), child)
+        refs = [weakref.ref(wl), weakref.ref(child)]
+        del wl, child
+        gc.collect()
+        self.assertEqual([r() for r in refs], [None, None])
+
+    def test_no_ecdsa(self):
+        code = (
+            "import sys\n"
+            "from slip0010.sd import SeedDerivation\n"
+            f"sd = SeedDerivation.derive_monero({self.vector.bip39!r}, '')\n"
+            "sd.address\n"
+            "from slip0010 import ed25519\n"
+            "from slip0010.wallet import Ed25519PublicKey\n"
+            "key = Ed25519PublicKey(ed25519.identity())\n"
+            "assert key != object() and not key == None\n"
+            "assert 'ecdsa' not in sys.modules, 'ecdsa imported'\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_secp256k1_child(self):
+        wl = Wallet.from_master_secret(bytes(range(16)))
+        child = wl.get_child(0, is_prime=True)
+        self.assertFalse(child.public_key.is_infinity())
+        self.assertIn("ecdsa", sys.modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
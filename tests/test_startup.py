@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+import unittest
+
+import startup
+
+# how many times over its budget startup may take on a slow runner
+WALL_SLACK = 5
+
+
+class TestStartup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # a fresh interpreter, nothing imported yet
+        out = subprocess.run(
+            [sys.executable, "derive.py", "--profile-startup"],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        cls.stderr = out.stderr
+        cls.report = json.loads(out.stdout)
+
+    def test_memory_budget(self):
+        budget = dict(startup.BUDGET, total_us=sys.maxsize)
+        self.assertEqual(
+            startup.over_budget(self.report, budget), [], self.stderr
+        )
+
+    def test_time_budget(self):
+        # wall time depends on the machine and its load, so only a
+        # startup far over budget fails
+        budget = dict(
+            total_us=startup.BUDGET["total_us"] * WALL_SLACK,
+            peak_bytes=sys.maxsize,
+        )
+        self.assertEqual(
+            startup.over_budget(self.report, budget), [], self.stderr
+        )
+
+    def test_report(self):
+        self.assertEqual(self.report["version"], startup.REPORT_VERSION)
+        phases = self.report["phases"]
+        self.assertEqual(
+            list(phases), ["curses", "curve_tables", "imports", "wordlists"]
+        )
+        self.assertEqual(phases["wordlists"]["calls"], 2)
+        self.assertEqual(phases["curve_tables"]["calls"], 1)
+        self.assertGreater(self.report["memory"]["peak_bytes"], 0)
+        names = [m["name"] for m in self.report["modules"]]
+        self.assertIn("bip39.data", names)
+        self.assertIn("curses", names)
+        self.assertNotIn("ecdsa", names)
+        for m in self.report["modules"]:
+            self.assertLessEqual(m["self_us"], m["cumulative_us"])
+
+    def test_text(self):
+        text = startup.to_text(self.report)
+        self.assertTrue(text.startswith("import time: self [us]"))
+        lines = text.splitlines()
+        self.assertEqual(len(lines), len(self.report["modules"]) + 7)
+        self.assertIn(" bip39.data", "".join(lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
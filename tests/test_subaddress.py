@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from slip0010 import ed25519 as crypto
+from slip0010 import ed25519_2
+from slip0010.subaddress import (
+    SubaddressGenerator,
+    SubaddressTable,
+    write_table,
+)
+
+VIEW_SEC = crypto.hash_to_scalar(b"view")
+SPEND_PUB = crypto.scalarmult_base(crypto.hash_to_scalar(b"spend"))
+
+
+def naive(major, minor):
+    if (major, minor) == (0, 0):
+        D = SPEND_PUB.v
+        C = ed25519_2.scalarmult_B(VIEW_SEC.v)
+    else:
+        data = (
+            b"SubAddr\x00"
+            + bytes(VIEW_SEC)
+            + major.to_bytes(4, "little")
+            + minor.to_bytes(4, "little")
+        )
+        m = crypto.hash_to_scalar(data)
+        D = ed25519_2.edwards_add(SPEND_PUB.v, ed25519_2.scalarmult_B(m.v))
+        C = ed25519_2.scalarmult(D, VIEW_SEC.v)
+    return ed25519_2.encodepoint(D), ed25519_2.encodepoint(C)
+
+
+class TestSubaddress(unittest.TestCase):
+    def test_generate(self):
+        gen = SubaddressGenerator(VIEW_SEC, SPEND_PUB)
+        got = list(gen.generate(range(2), range(3), batch_size=4))
+        self.assertEqual(len(got), 6)
+        for major, minor, D, C in got:
+            self.assertEqual((D, C), naive(major, minor))
+            self.assertEqual((D, C), gen.get(major, minor))
+
+    def test_table(self):
+        gen = SubaddressGenerator(VIEW_SEC, SPEND_PUB)
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            write_table(path, gen, range(1, 3), range(2))
+            with SubaddressTable(path) as table:
+                self.assertEqual(len(table), 4)
+                self.assertEqual(table[2, 1], naive(2, 1))
+                keys = table.spend_keys()
+                self.assertEqual(keys[naive(1, 0)[0]], (1, 0))
+                with self.assertRaises(KeyError):
+                    table[0, 0]
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
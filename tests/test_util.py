@@ -1,4 +1,8 @@
+import threading
+import weakref
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 from hypothesis import assume, given  # type: ignore
 from hypothesis import strategies as st
@@ -6,6 +10,8 @@ from hypothesis import strategies as st
 import Crypto.Util.strxor as ref  # type: ignore
 
 from util import (
+    memoize,
+    memoize_method,
     strxor,
     IntegerUtils as I,
     BytesUtils as B,
@@ -25,6 +31,46 @@ class TestUtils(unittest.TestCase):
         (b1, b2) = tup
         self.assertEqual(strxor(b1, b2), ref.strxor(b1, b2))
 
+    def test_memoize_kwargs(self):
+        @memoize
+        def f(a, b=0):
+            return [a, b]
+
+        self.assertEqual(f(1, b=2), [1, 2])
+        self.assertEqual(f(1, b=3), [1, 3])
+        self.assertIs(f(1, b=2), f(1, b=2))
+
+    def test_memoize_method(self):
+        class A:
+            @memoize_method
+            def f(self, a):
+                return [a]
+
+        x = A()
+        self.assertIs(x.f(1), x.f(1))
+        self.assertIsNot(A().f(1), x.f(1))
+        ref = weakref.ref(x)
+        del x
+        self.assertIsNone(ref())
+
+    def test_memoize_threads(self):
+        n = 8
+        barrier = threading.Barrier(n)
+
+        @memoize
+        def f(a):
+            time.sleep(0.01)
+            return object()
+
+        def call(_):
+            barrier.wait()
+            return f(1)
+
+        with ThreadPoolExecutor(n) as ex:
+            results = list(ex.map(call, range(n)))
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(len(f.cache), 1)
+
 
 class TestIntegerUtils(unittest.TestCase):
     def test_to_bstr(self):
@@ -1,6 +1,16 @@
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from hypothesis import given  # type: ignore
+from hypothesis import strategies as st
+
+from bip39 import wordlist, validate_checksum
+from monero_mnemonic.data import wordlist as monero_wordlist
+from util.wordindex import WordIndex, levenshtein
+from util.wordlist import Singleton
 
-from bip39 import wordlist
 # from util import err_print
 
 
@@ -15,6 +25,58 @@ class TestUtils(unittest.TestCase):
             assert wordlist.unique_prefixes[pref] == word
         # assert 1 == 2
 
+    def test_singleton_threads(self):
+        n = 8
+        barrier = threading.Barrier(n)
+        inits = []
+
+        class Slow(metaclass=Singleton):
+            def __init__(self):
+                inits.append(self)
+                time.sleep(0.01)
+
+        def make(_):
+            barrier.wait()
+            return Slow()
+
+        with ThreadPoolExecutor(n) as ex:
+            instances = list(ex.map(make, range(n)))
+        self.assertEqual(len(inits), 1)
+        self.assertTrue(all(i is inits[0] for i in instances))
+
+
+class TestWordIndex(unittest.TestCase):
+    index = WordIndex(monero_wordlist.wordlist)
+
+    @given(st.text(alphabet="abcdeilmnorstuyz", min_size=1, max_size=9))
+    def test_search(self, word):
+        self.assertEqual(
+            self.index.search(word),
+            sorted(
+                (d, w)
+                for d, w in (
+                    (levenshtein(word, w), w) for w in monero_wordlist.wordlist
+                )
+                if d <= 2
+            ),
+        )
+
+    def test_suggest(self):
+        self.assertEqual(wordlist.suggest("abandn"), ["abandon"])
+        self.assertEqual(wordlist.suggest("abot", 1)[0], "about")
+        self.assertIn("zodiac", monero_wordlist.suggest("zodaic"))
+        # prefixes match prefixes
+        self.assertIn("abandon", wordlist.suggest("abam", 1))
+
+    def test_substitutions(self):
+        words = ["abandon"] * 11 + ["abot"]
+        valid = [
+            phrase
+            for phrase in wordlist.substitutions(words)
+            if validate_checksum(phrase, len(phrase))
+        ]
+        self.assertIn(["abandon"] * 11 + ["about"], valid)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,14 +6,17 @@ from bip39 import (
     Bip39WordsNum,
     validate_checksum,
 )
+from util import hash160_backend
 from util.debug import (
     get_debug,
     set_debug_screen,
+    scr_debug_print,
 )
 from typing import (
     Dict,
     List,
     Optional,
+    Sequence,
 )
 
 from ui.input import Input, Screen
@@ -45,7 +48,9 @@ def _bip39_word(n: int, s: int) -> str:
     return f"Enter word #{n:02}/{s}: "
 
 
-def _bip39_word_invalid(w: str) -> str:
+def _bip39_word_invalid(w: str, suggestions: Sequence[str] = ()) -> str:
+    if suggestions:
+        return f"Invalid word. Did you mean: {', '.join(suggestions)}? ({w})"
     return f"Invalid word. Try again. ({w})"
 
 
@@ -233,7 +238,8 @@ def read_words(screen: Screen, biplen: int) -> List[str]:
             word_valid = wordlist.contains(full_word)
             if not word_valid:
                 screen.addstr(" ")
-                write_err(screen, _bip39_word_invalid(word))
+                suggestions = wordlist.suggest(word)[:5]
+                write_err(screen, _bip39_word_invalid(word, suggestions))
             if word_prefix:
                 write_info(screen, f" ({full_word})")
             advance_line(screen)
@@ -269,6 +275,7 @@ def program(screen: Screen) -> bool:
     screen.clear()
 
     if DEBUG:
+        scr_debug_print(f"hash160: {hash160_backend()}")
         biplen = Bip39WordsNum(12)
     else:
         prompt = _get_initial_prompt(screen)
@@ -4,7 +4,19 @@ import os
 import signal
 import hashlib
 from sys import stderr
-from typing import Any, Union, Literal, Optional, TYPE_CHECKING
+from collections import deque
+from queue import SimpleQueue
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Union,
+    Literal,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
 from binascii import unhexlify
 from functools import wraps
 from .ripemd160 import RIPEMD160  # type: ignore
@@ -215,19 +227,92 @@ def lower_escdelay():
 
 
 def memoize(f):
-    """Memoization decorator for a function taking one or more arguments."""
+    """Memoization decorator for a function taking one or more arguments.
+
+    Safe to call from many threads: the cache exists before the first
+    call and is only added to with setdefault, so racing callers may each
+    compute a value but all return the first one stored.
+    """
+    cache: dict = {}
+    f.cache = cache
 
     def _c(*args, **kwargs):
-        if not hasattr(f, "cache"):
-            f.cache = {}
-        key = (args, tuple(kwargs))
-        if key not in f.cache:
-            f.cache[key] = f(*args, **kwargs)
-        return f.cache[key]
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            return cache[key]
+        except KeyError:
+            return cache.setdefault(key, f(*args, **kwargs))
 
     return wraps(f)(_c)
 
 
+def memoize_method(f):
+    """memoize for methods, caching on the instance.
+
+    The cache lives in the instance's __dict__, so it is freed with the
+    instance rather than keeping every instance (and its keys) alive.
+    """
+    attr = f"_{f.__name__}_cache"
+
+    @wraps(f)
+    def _c(self, *args, **kwargs):
+        cache = self.__dict__.get(attr)
+        if cache is None:
+            cache = self.__dict__.setdefault(attr, {})
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            return cache[key]
+        except KeyError:
+            return cache.setdefault(key, f(self, *args, **kwargs))
+
+    return _c
+
+
+def bounded_imap(
+    pool, func: Callable, iterable: Iterable, window: int
+) -> Iterator:
+    """Ordered pool.imap with at most window tasks in flight.
+
+    Unlike Pool.imap, the input is only consumed as results are taken,
+    so memory stays flat on unbounded inputs.
+    """
+    pending: deque = deque()
+    for item in iterable:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def bounded_imap_unordered(
+    pool, func: Callable, iterable: Iterable, window: int
+) -> Iterator:
+    """bounded_imap yielding results in completion order."""
+    done: SimpleQueue = SimpleQueue()
+    in_flight = 0
+
+    def take():
+        ok, value = done.get()
+        if not ok:
+            raise value
+        return value
+
+    for item in iterable:
+        pool.apply_async(
+            func,
+            (item,),
+            callback=lambda r: done.put((True, r)),
+            error_callback=lambda e: done.put((False, e)),
+        )
+        in_flight += 1
+        if in_flight >= window:
+            in_flight -= 1
+            yield take()
+    for _ in range(in_flight):
+        yield take()
+
+
 def hash160_hashlib(data):
     """Return ripemd160(sha256(data))"""
     dig = hashlib.sha256(data).digest()
@@ -235,8 +320,53 @@ def hash160_hashlib(data):
     return rh
 
 
+def _ripemd160_builtin(data: bytes) -> bytes:
+    return RIPEMD160(data).digest()
+
+
+Ripemd160Backend = Tuple[str, Callable[[bytes], bytes]]
+
+
+def _probe_ripemd160() -> Ripemd160Backend:
+    """Pick the fastest RIPEMD-160 available.
+
+    OpenSSL 3 only offers ripemd160 with the legacy provider loaded, so
+    hashlib is tried first, then pycryptodome, then the in-tree version.
+    """
+    try:
+        hashlib.new("ripemd160", b"")
+        return "hashlib", lambda d: hashlib.new("ripemd160", d).digest()
+    except ValueError:
+        pass
+    try:
+        from Crypto.Hash import RIPEMD160 as CryptoRIPEMD160  # type: ignore
+
+        return "pycryptodome", lambda d: CryptoRIPEMD160.new(d).digest()
+    except ImportError:
+        pass
+    return "builtin", _ripemd160_builtin
+
+
+_ripemd160_backend: Optional[Ripemd160Backend] = None
+
+
+def _ripemd160_impl() -> Ripemd160Backend:
+    # racing threads may both probe, they pick the same backend
+    global _ripemd160_backend  # pylint: disable=W0603
+    if _ripemd160_backend is None:
+        _ripemd160_backend = _probe_ripemd160()
+    return _ripemd160_backend
+
+
+def hash160_backend() -> str:
+    """Name of the RIPEMD-160 backend used by hash160, for diagnostics."""
+    return _ripemd160_impl()[0]
+
+
+def ripemd160(data: bytes) -> bytes:
+    return _ripemd160_impl()[1](data)
+
+
 def hash160(data):
-    dig = hashlib.sha256(data).digest()
-    msg = bytearray(dig)
-    rh = RIPEMD160().calculate_hash(msg)
-    return unhexlify(rh)
+    """Return ripemd160(sha256(data)), on the fastest available backend"""
+    return ripemd160(hashlib.sha256(data).digest())
@@ -0,0 +1,79 @@
+"""Nearest-word lookups over a word list by edit distance"""
+
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+
+def levenshtein(a: str, b: str, limit: Optional[int] = None) -> int:
+    """
+    Edit distance between a and b. With a limit, stops early and returns
+    limit + 1 once the distance is known to exceed it.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(
+                min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            )
+        if limit is not None and min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def deletions(word: str, depth: int) -> Set[str]:
+    """word and every string obtained by deleting up to depth characters"""
+    out = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))}
+        out |= frontier
+    return out
+
+
+class WordIndex:
+    """
+    Deletion-neighbourhood index: two words within edit distance d share a
+    string reachable from both by at most d deletions. Every word is
+    indexed under its deletions, a query looks up its own and only
+    verifies the few candidates found, instead of the whole list.
+    """
+
+    def __init__(self, words: Iterable[str], max_distance: int = 2) -> None:
+        self.max_distance = max_distance
+        self.index: Dict[str, List[str]] = {}
+        for word in words:
+            for key in deletions(word, max_distance):
+                self.index.setdefault(key, []).append(word)
+
+    def search(
+        self, word: str, max_distance: Optional[int] = None
+    ) -> List[Tuple[int, str]]:
+        """
+        Words within max_distance (at most the index depth) of word, as
+        (distance, word) pairs sorted by distance, then alphabetically.
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        if max_distance > self.max_distance:
+            raise ValueError(f"Index only covers distance {self.max_distance}")
+        candidates = set()
+        for key in deletions(word, max_distance):
+            candidates.update(self.index.get(key, ()))
+        found = []
+        for cand in candidates:
+            d = levenshtein(word, cand, max_distance)
+            if d <= max_distance:
+                found.append((d, cand))
+        return sorted(found)
@@ -2,20 +2,34 @@ from typing import (
     Any,
     Optional,
     Dict,
+    Iterator,
     List,
+    Sequence,
 )
 from functools import reduce
+from itertools import product
+from threading import RLock
+
+from .instrument import stage
+from .wordindex import WordIndex
 
 
 class Singleton(type):
     # TODO proper self type
     _instances: Dict[Any, Any] = {}
+    # reentrant, an instance may construct another singleton
+    _lock = RLock()
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(
-                *args, **kwargs
-            )
+        try:
+            return cls._instances[cls]
+        except KeyError:
+            pass
+        with Singleton._lock:
+            if cls not in cls._instances:
+                cls._instances[cls] = super(Singleton, cls).__call__(
+                    *args, **kwargs
+                )
         return cls._instances[cls]
 
 
@@ -26,7 +40,10 @@ class Wordlist:
     m_words_to_idx: Dict[str, int] = {}
     unique_prefix_length: int = 0
     unique_prefixes: Dict[str, str] = {}
+    _word_index: Optional[WordIndex] = None
+    _prefix_index: Optional[WordIndex] = None
 
+    @stage("Wordlist.__init__")
     def __init__(self):
         n = len(self.wordlist)
         self.WORDS_LIST_NUM = n
@@ -51,3 +68,42 @@ class Wordlist:
 
     def contains(self, word: str) -> bool:
         return self.get_word_idx_option(word) is not None
+
+    def resolve(self, word: str) -> Optional[str]:
+        """The full word for a word or its unique prefix"""
+        if self.contains(word):
+            return word
+        if len(word) == self.unique_prefix_length:
+            return self.unique_prefixes.get(word)
+        return None
+
+    def suggest(self, word: str, max_distance: int = 2) -> List[str]:
+        """
+        Words within max_distance edits of a mistyped word, closest first.
+        Inputs no longer than a unique prefix are matched against the
+        prefixes. The index is built on first use.
+        """
+        if self.unique_prefix_length and len(word) <= self.unique_prefix_length:
+            if self._prefix_index is None:
+                self._prefix_index = WordIndex(self.unique_prefixes)
+            return [
+                self.unique_prefixes[p]
+                for _, p in self._prefix_index.search(word, max_distance)
+            ]
+        if self._word_index is None:
+            self._word_index = WordIndex(self.wordlist)
+        return [w for _, w in self._word_index.search(word, max_distance)]
+
+    def substitutions(
+        self, words: Sequence[str], max_distance: int = 1
+    ) -> Iterator[List[str]]:
+        """
+        Every phrase obtained by keeping the valid words (or prefixes) and
+        replacing each invalid one with one of its suggestions.
+        """
+        choices = []
+        for word in words:
+            full = self.resolve(word)
+            choices.append([full] if full else self.suggest(word, max_distance))
+        for phrase in product(*choices):
+            yield list(phrase)